@@ -0,0 +1,32 @@
+"""Drop redundant scene_embeddings index and add job polling index
+
+Revision ID: 3f9a0d6c2e17
+Revises: 7c1e4b2a9d53
+Create Date: 2025-09-02 11:03:27.904415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a0d6c2e17'
+down_revision: Union[str, None] = '7c1e4b2a9d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (scene_id, chunk_no) already serves scene_id lookups as a prefix, so the
+    # single-column index only costs an extra B-tree update per insert
+    op.drop_index(op.f('ix_scene_embeddings_scene_id'), table_name='scene_embeddings')
+    
+    # Worker pollers filter on status and order by created_at
+    op.create_index('ix_jobs_status_created', 'jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_created', table_name='jobs')
+    op.create_index(op.f('ix_scene_embeddings_scene_id'), 'scene_embeddings', ['scene_id'], unique=False)
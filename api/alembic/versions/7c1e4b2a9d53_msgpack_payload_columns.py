@@ -0,0 +1,113 @@
+"""Store JSON payload columns as MessagePack and embeddings as float32 bytes
+
+Revision ID: 7c1e4b2a9d53
+Revises: 49190b0134b5
+Create Date: 2025-09-02 10:12:41.518204
+
+"""
+from typing import Any, Sequence, Union
+import json
+import struct
+
+from alembic import op
+import msgspec
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2a9d53'
+down_revision: Union[str, None] = '49190b0134b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Payload columns converted from JSON text to MessagePack, per table
+PAYLOAD_COLUMNS = {
+    'scenes': ['beats_json', 'links_json'],
+    'jobs': ['agents_json', 'result_json'],
+    'artifacts': ['metrics_before', 'metrics_after', 'receipts_json'],
+}
+
+# Same frame as app.models.EmbeddingType; kept local so the migration does
+# not change if the model code does
+_EMBEDDING_HEADER = struct.Struct(">I")
+_EMBEDDING_DTYPE = np.dtype("<f4")
+# Later code also writes int8 frames: the top bit of the length is set and a
+# float32 scale precedes one signed byte per dimension
+_INT8_FLAG = 0x80000000
+_INT8_SCALE = struct.Struct("<f")
+
+
+def _load_json(value: Any) -> Any:
+    # SQLite hands back JSON as text; PostgreSQL drivers decode it already
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _pack_payload(value: Any) -> Any:
+    return None if value is None else msgspec.msgpack.encode(_load_json(value))
+
+
+def _unpack_payload(value: Any) -> Any:
+    return None if value is None else json.dumps(msgspec.msgpack.decode(value))
+
+
+def _pack_embedding(value: Any) -> Any:
+    if value is None:
+        return None
+    vector = np.asarray(_load_json(value), dtype=_EMBEDDING_DTYPE).ravel()
+    return _EMBEDDING_HEADER.pack(vector.size) + vector.tobytes()
+
+
+def _unpack_embedding(value: Any) -> Any:
+    if value is None:
+        return None
+    (size,) = _EMBEDDING_HEADER.unpack_from(value)
+    if size & _INT8_FLAG:
+        (scale,) = _INT8_SCALE.unpack_from(value, _EMBEDDING_HEADER.size)
+        values = np.frombuffer(
+            value, dtype=np.int8, count=size & ~_INT8_FLAG,
+            offset=_EMBEDDING_HEADER.size + _INT8_SCALE.size
+        )
+        vector = values.astype(np.float32) * np.float32(scale)
+    else:
+        vector = np.frombuffer(value, dtype=_EMBEDDING_DTYPE, count=size, offset=_EMBEDDING_HEADER.size)
+    return json.dumps(vector.tolist())
+
+
+def _swap_columns(table: str, columns: Sequence[str], new_type: sa.types.TypeEngine, convert) -> None:
+    """Copy each column into a converted twin, then replace the original."""
+    bind = op.get_bind()
+
+    with op.batch_alter_table(table) as batch_op:
+        for column in columns:
+            batch_op.add_column(sa.Column(f'{column}_new', new_type, nullable=True))
+
+    select_cols = ', '.join(['id'] + list(columns))
+    rows = bind.execute(sa.text(f'SELECT {select_cols} FROM {table}')).fetchall()
+    if rows:
+        assignments = ', '.join(f'{column}_new = :{column}' for column in columns)
+        update = sa.text(f'UPDATE {table} SET {assignments} WHERE id = :id')
+        bind.execute(update, [
+            {'id': row[0], **{column: convert(row[i + 1]) for i, column in enumerate(columns)}}
+            for row in rows
+        ])
+
+    with op.batch_alter_table(table) as batch_op:
+        for column in columns:
+            batch_op.drop_column(column)
+            batch_op.alter_column(f'{column}_new', new_column_name=column)
+
+
+def upgrade() -> None:
+    for table, columns in PAYLOAD_COLUMNS.items():
+        _swap_columns(table, columns, sa.LargeBinary(), _pack_payload)
+
+    _swap_columns('scene_embeddings', ['embedding'], sa.LargeBinary(), _pack_embedding)
+
+
+def downgrade() -> None:
+    _swap_columns('scene_embeddings', ['embedding'], sa.JSON(), _unpack_embedding)
+
+    for table, columns in PAYLOAD_COLUMNS.items():
+        _swap_columns(table, columns, sa.JSON(), _unpack_payload)
@@ -0,0 +1,105 @@
+"""Use a native pgvector column with an HNSW index for embeddings on PostgreSQL
+
+Revision ID: b84d1f5e0a62
+Revises: 3f9a0d6c2e17
+Create Date: 2025-09-02 14:27:09.630118
+
+"""
+from typing import Sequence, Union
+import struct
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+try:
+    from pgvector.sqlalchemy import Vector
+    VECTOR_AVAILABLE = True
+except ImportError:
+    Vector = None
+    VECTOR_AVAILABLE = False
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84d1f5e0a62'
+down_revision: Union[str, None] = '3f9a0d6c2e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EMBEDDING_DIM = 384
+
+# Same frame as app.models.EmbeddingType for the LargeBinary fallback
+_EMBEDDING_HEADER = struct.Struct(">I")
+_EMBEDDING_DTYPE = np.dtype("<f4")
+# int8 frames: top bit of the length set, then a float32 scale and one
+# signed byte per dimension
+_INT8_FLAG = 0x80000000
+_INT8_SCALE = struct.Struct("<f")
+
+
+def _use_pgvector() -> bool:
+    # SQLite (and PostgreSQL without pgvector installed) keep the float32 frame
+    return VECTOR_AVAILABLE and op.get_bind().dialect.name == 'postgresql'
+
+
+def _decode_frame(frame: bytes) -> np.ndarray:
+    (size,) = _EMBEDDING_HEADER.unpack_from(frame)
+    if size & _INT8_FLAG:
+        (scale,) = _INT8_SCALE.unpack_from(frame, _EMBEDDING_HEADER.size)
+        values = np.frombuffer(
+            frame, dtype=np.int8, count=size & ~_INT8_FLAG,
+            offset=_EMBEDDING_HEADER.size + _INT8_SCALE.size
+        )
+        return values.astype(np.float32) * np.float32(scale)
+    return np.frombuffer(frame, dtype=_EMBEDDING_DTYPE, count=size, offset=_EMBEDDING_HEADER.size)
+
+
+def upgrade() -> None:
+    if not _use_pgvector():
+        return
+
+    bind = op.get_bind()
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    op.add_column('scene_embeddings', sa.Column('embedding_vec', Vector(EMBEDDING_DIM), nullable=True))
+
+    rows = bind.execute(sa.text('SELECT id, embedding FROM scene_embeddings WHERE embedding IS NOT NULL')).fetchall()
+    if rows:
+        update = sa.text('UPDATE scene_embeddings SET embedding_vec = CAST(:vec AS vector) WHERE id = :id')
+        params = []
+        for row_id, frame in rows:
+            vector = _decode_frame(frame)
+            params.append({'id': row_id, 'vec': '[' + ','.join(map(str, vector.tolist())) + ']'})
+        bind.execute(update, params)
+
+    op.drop_column('scene_embeddings', 'embedding')
+    op.alter_column('scene_embeddings', 'embedding_vec', new_column_name='embedding')
+
+    # Cosine ANN index so similarity search no longer scans every row
+    op.execute(
+        'CREATE INDEX ix_scene_embeddings_hnsw ON scene_embeddings '
+        'USING hnsw (embedding vector_cosine_ops)'
+    )
+
+
+def downgrade() -> None:
+    if not _use_pgvector():
+        return
+
+    bind = op.get_bind()
+    op.execute('DROP INDEX IF EXISTS ix_scene_embeddings_hnsw')
+    op.add_column('scene_embeddings', sa.Column('embedding_bin', sa.LargeBinary(), nullable=True))
+
+    rows = bind.execute(sa.text(
+        'SELECT id, embedding::text FROM scene_embeddings WHERE embedding IS NOT NULL'
+    )).fetchall()
+    if rows:
+        update = sa.text('UPDATE scene_embeddings SET embedding_bin = :frame WHERE id = :id')
+        params = []
+        for row_id, text_value in rows:
+            vector = np.array(text_value.strip('[]').split(','), dtype=_EMBEDDING_DTYPE)
+            params.append({'id': row_id, 'frame': _EMBEDDING_HEADER.pack(vector.size) + vector.tobytes()})
+        bind.execute(update, params)
+
+    op.drop_column('scene_embeddings', 'embedding')
+    op.alter_column('scene_embeddings', 'embedding_bin', new_column_name='embedding')
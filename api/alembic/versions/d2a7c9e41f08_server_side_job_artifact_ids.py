@@ -0,0 +1,54 @@
+"""Generate job and artifact ids in the database
+
+Revision ID: d2a7c9e41f08
+Revises: b84d1f5e0a62
+Create Date: 2025-09-03 10:12:45.218307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c9e41f08'
+down_revision: Union[str, None] = 'b84d1f5e0a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_TABLES = ('jobs', 'artifacts')
+
+# Same expression as app.models.gen_random_uuid on SQLite
+_SQLITE_UUID = (
+    "(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "substr('89ab', abs(random()) % 4 + 1, 1) || substr(lower(hex(randomblob(2))), 2) || '-' || "
+    "lower(hex(randomblob(6))))"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it before that
+        op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+        for table in _TABLES:
+            op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()::text'))
+        return
+
+    # SQLite cannot change a column default in place, so rebuild the tables
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('id', existing_type=sa.String(), server_default=sa.text(_SQLITE_UUID))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in _TABLES:
+            op.alter_column(table, 'id', server_default=None)
+        return
+
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('id', existing_type=sa.String(), server_default=None)
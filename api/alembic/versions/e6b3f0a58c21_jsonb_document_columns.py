@@ -0,0 +1,53 @@
+"""Store queryable JSON columns as jsonb on PostgreSQL
+
+Revision ID: e6b3f0a58c21
+Revises: d2a7c9e41f08
+Create Date: 2025-09-03 11:40:18.662094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b3f0a58c21'
+down_revision: Union[str, None] = 'd2a7c9e41f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns still held as JSON; the MessagePack payload columns are untouched
+DOCUMENT_COLUMNS = {
+    'characters': [
+        'voice_tags_json', 'preferred_words_json', 'banned_words_json',
+        'arc_flags_json', 'canon_quotes_json',
+    ],
+    'artifacts': ['meta_data'],
+    'scene_embeddings': ['meta'],
+}
+
+
+def upgrade() -> None:
+    # SQLite has a single JSON representation; nothing to convert
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, columns in DOCUMENT_COLUMNS.items():
+        for column in columns:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb')
+
+    op.execute(
+        'CREATE INDEX idx_artifact_meta_gin ON artifacts '
+        'USING gin (meta_data jsonb_path_ops)'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP INDEX IF EXISTS idx_artifact_meta_gin')
+    for table, columns in DOCUMENT_COLUMNS.items():
+        for column in columns:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json')
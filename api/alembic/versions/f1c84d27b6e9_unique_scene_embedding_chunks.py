@@ -0,0 +1,32 @@
+"""Make (scene_id, chunk_no) unique on scene_embeddings
+
+Revision ID: f1c84d27b6e9
+Revises: e6b3f0a58c21
+Create Date: 2025-09-03 13:05:51.390742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c84d27b6e9'
+down_revision: Union[str, None] = 'e6b3f0a58c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-indexing replaces a scene's chunks, so duplicates are leftovers; keep one of each
+    op.execute(
+        'DELETE FROM scene_embeddings WHERE id NOT IN '
+        '(SELECT MIN(id) FROM scene_embeddings GROUP BY scene_id, chunk_no)'
+    )
+    op.drop_index('ix_scene_embeddings_scene_chunk', table_name='scene_embeddings')
+    op.create_index('ix_scene_embeddings_scene_chunk', 'scene_embeddings', ['scene_id', 'chunk_no'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scene_embeddings_scene_chunk', table_name='scene_embeddings')
+    op.create_index('ix_scene_embeddings_scene_chunk', 'scene_embeddings', ['scene_id', 'chunk_no'], unique=False)
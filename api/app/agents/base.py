@@ -2,9 +2,18 @@
 import json
 from typing import Dict, Any, List, Optional, Type
 from abc import ABC, abstractmethod
-from pydantic import BaseModel, ValidationError
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, ValidationError
+import msgspec
 import logging
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -36,6 +45,28 @@ class AgentOutput(BaseModel):
     data: Dict[str, Any]
 
 
+class LLMCallResult(msgspec.Struct):
+    """Result of Agent.call_llm; on failure only error is set."""
+    content: Optional[str] = None
+    model: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+    cost_usd: Optional[float] = None
+    error: Optional[str] = None
+
+
+# Adapters for the shared output schemas are built at import time so the
+# pydantic-core schema build is paid once at startup, not on first request
+_ADAPTERS: Dict[Type[BaseModel], TypeAdapter] = {
+    model: TypeAdapter(model) for model in (AgentOutput, DiffOutput, FindingsOutput)
+}
+
+
+@lru_cache(maxsize=64)
+def _schema_adapter(schema_model: Type[BaseModel]) -> TypeAdapter:
+    """Get a cached TypeAdapter for a schema model (keyed by class identity)."""
+    return TypeAdapter(schema_model)
+
+
 class Agent(ABC):
     """Base agent class for all AI agents."""
     
@@ -177,17 +208,18 @@ class Agent(ABC):
         try:
             # If data is string, try to parse as JSON
             if isinstance(data, str):
-                data = json.loads(data)
+                data = _json_loads(data)
             
-            # Validate with Pydantic model
-            validated = schema_model.model_validate(data)
+            # Validate with the cached adapter for this Pydantic model
+            adapter = _ADAPTERS.get(schema_model) or _schema_adapter(schema_model)
+            validated = adapter.validate_python(data)
             return {
                 "valid": True,
-                "data": validated.model_dump(),
+                "data": adapter.dump_python(validated),
                 "errors": []
             }
         
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
             return {
                 "valid": False,
                 "data": None,
@@ -221,7 +253,7 @@ class Agent(ABC):
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         json_mode: bool = False
-    ) -> Dict[str, Any]:
+    ) -> LLMCallResult:
         """
         Call LLM with error handling.
         
@@ -232,10 +264,10 @@ class Agent(ABC):
             json_mode: Request JSON response format
             
         Returns:
-            LLM response or error dict
+            LLMCallResult with the response fields, or only error set.
         """
         if not self.llm_client:
-            return {"error": "No LLM client configured"}
+            return LLMCallResult(error="No LLM client configured")
         
         try:
             result = await self.llm_client.complete(
@@ -248,19 +280,19 @@ class Agent(ABC):
             
             if isinstance(result, dict) and "error" in result:
                 logger.error(f"LLM error in {self.name}: {result['error']}")
-                return result
+                return LLMCallResult(error=result["error"])
             
-            return {
-                "content": result.content,
-                "model": result.model,
-                "usage": result.usage,
-                "cost_usd": result.cost_usd
-            }
+            return LLMCallResult(
+                content=result.content,
+                model=result.model,
+                usage=result.usage,
+                cost_usd=result.cost_usd
+            )
             
         except Exception as e:
             error_msg = f"Agent {self.name} LLM call failed: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg}
+            return LLMCallResult(error=error_msg)
     
     def log_result(self, result: Dict[str, Any]) -> None:
         """Log agent execution result."""
@@ -1,13 +1,40 @@
 """Lore Archivist agent for canon validation as specified in Prompt 13."""
-import json
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from collections import OrderedDict
+from itertools import islice
+import asyncio
 import logging
+import re
 
 from .base import Agent, FindingsOutput
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Canon chunk topic keywords, one bit each. Plain substring checks so that
+# e.g. "rules" and "lawful" still match, as the original keyword checks did.
+_CANON_KEYWORDS = (
+    "character",
+    "magic", "technology", "rule", "law", "society",
+    "chapter", "before", "after", "previous", "timeline"
+)
+_CHARACTER_MASK = 0b00000000001
+_WORLD_MASK = 0b00000111110
+_TIMELINE_MASK = 0b11111000000
+
+# Retrieved chunks shorter than this are too small to carry canon and are
+# dropped before any checks run
+_MIN_CHUNK_CHARS = 80
+
+# Keyword masks of canon chunks seen in earlier runs, keyed by
+# (source_path, start_line) and holding (text, mask). Neighbouring scenes
+# retrieve largely the same chunks, so most lookups hit.
+_CANON_MASK_CACHE: "OrderedDict[Tuple[Any, Any], Tuple[str, int]]" = OrderedDict()
+_CANON_MASK_CACHE_SIZE = 10000
+
+# Whitespace-delimited tokens, matching str.split() without building the list
+_TOKEN_RE = re.compile(r'\S+')
+
 
 class Finding(BaseModel):
     """Schema for a single lore finding."""
@@ -28,7 +55,8 @@ async def run_lore_archivist(
     scene_text: str,
     scene_meta: Dict[str, Any],
     retrieve_fn: Callable[[str, int, Optional[Dict]], List[Dict]],
-    model: str = "anthropic/claude-3-opus"
+    model: str = "anthropic/claude-3-opus",
+    retrieve_batch_fn: Optional[Callable[[List[str], int, Optional[Dict]], List[List[Dict]]]] = None
 ) -> Dict[str, Any]:
     """
     Run lore archivist to validate changes against canon with receipts.
@@ -36,8 +64,10 @@ async def run_lore_archivist(
     Args:
         scene_text: The scene text to validate
         scene_meta: Scene metadata (chapter, POV, location, etc.)
-        retrieve_fn: Function to retrieve canon context
+        retrieve_fn: Function to retrieve canon context (sync or async)
         model: LLM model to use (deterministic at temperature=0.3)
+        retrieve_batch_fn: Optional batched retriever (sync or async) taking all
+            queries at once; preferred over retrieve_fn when given
         
     Returns:
         Dictionary with findings, receipts, and optional correction diff
@@ -47,40 +77,60 @@ async def run_lore_archivist(
         search_queries = _build_canon_queries(scene_text, scene_meta)
         canon_chunks = []
         
-        for query in search_queries:
-            chunks = retrieve_fn(query, 5, {"type": "codex"})
+        if retrieve_batch_fn is not None:
+            # One round-trip for all queries
+            results = await _retrieve(retrieve_batch_fn, search_queries, 5, {"type": "codex"})
+        else:
+            # Queries are independent, so fan them out concurrently
+            results = await asyncio.gather(*(
+                _retrieve(retrieve_fn, query, 5, {"type": "codex"}) for query in search_queries
+            ))
+        for chunks in results:
             canon_chunks.extend(chunks)
         
-        # Remove duplicates based on source_path
+        # Remove duplicates based on source_path and start line, noting which
+        # topic keywords any unique chunk mentions. Chunks may be shared with
+        # the retrieval cache, so the mask is kept here rather than on them.
         seen_sources = set()
         unique_chunks = []
+        canon_mask = 0
         for chunk in canon_chunks:
-            source_key = f"{chunk.get('source_path', '')}:{chunk.get('start_line', 0)}"
+            # Skip fragments and chunks that cannot be cited
+            text = chunk.get("text") or ""
+            if len(text) < _MIN_CHUNK_CHARS:
+                continue
+            if not chunk.get('source_path') and not chunk.get('start_line'):
+                continue
+            
+            source_key = (chunk.get('source_path', ''), chunk.get('start_line', 0))
             if source_key not in seen_sources:
                 seen_sources.add(source_key)
                 unique_chunks.append(chunk)
+                canon_mask |= _cached_keyword_mask(source_key, text)
         
         # Analyze for canon violations
         findings = []
         receipts = []
+        # Lowercase once for all checks; chunk filters are case-insensitive regexes
+        scene_lower = scene_text.lower()
         
         # Check character consistency
         char_findings, char_receipts = _check_character_consistency(
-            scene_text, scene_meta, unique_chunks
+            scene_text, scene_lower, scene_meta, canon_mask
         )
         findings.extend(char_findings)
         receipts.extend(char_receipts)
         
         # Check world rule violations
         world_findings, world_receipts = _check_world_rules(
-            scene_text, scene_meta, unique_chunks
+            scene_text, scene_lower, scene_meta, canon_mask
         )
         findings.extend(world_findings)
         receipts.extend(world_receipts)
         
         # Check timeline/continuity
         timeline_findings, timeline_receipts = _check_timeline_consistency(
-            scene_text, scene_meta, unique_chunks
+            scene_text, scene_lower, scene_meta, canon_mask
         )
         findings.extend(timeline_findings)
         receipts.extend(timeline_receipts)
@@ -118,6 +168,45 @@ async def run_lore_archivist(
         }
 
 
+async def _retrieve(
+    retrieve_fn: Callable[..., Any],
+    query: Any,
+    k: int,
+    filters: Optional[Dict]
+) -> Any:
+    """Call retrieve_fn, awaiting async retrievers and running sync ones in a thread."""
+    if asyncio.iscoroutinefunction(retrieve_fn):
+        return await retrieve_fn(query, k, filters)
+    return await asyncio.to_thread(retrieve_fn, query, k, filters)
+
+
+def _keyword_mask(text: str) -> int:
+    """Return the bitmask of _CANON_KEYWORDS that occur in text (case-insensitive)."""
+    text_lower = text.lower()
+    mask = 0
+    for bit, keyword in enumerate(_CANON_KEYWORDS):
+        if keyword in text_lower:
+            mask |= 1 << bit
+    return mask
+
+
+def _cached_keyword_mask(source_key: Tuple[Any, Any], text: str) -> int:
+    """Return the keyword mask for a canon chunk, reusing it across runs."""
+    entry = _CANON_MASK_CACHE.get(source_key)
+    # Re-indexing can change the text at a location, so only trust the entry
+    # if the text still matches (usually the very same string object)
+    if entry is not None and entry[0] == text:
+        _CANON_MASK_CACHE.move_to_end(source_key)
+        return entry[1]
+    
+    mask = _keyword_mask(text)
+    _CANON_MASK_CACHE[source_key] = (text, mask)
+    _CANON_MASK_CACHE.move_to_end(source_key)
+    if len(_CANON_MASK_CACHE) > _CANON_MASK_CACHE_SIZE:
+        _CANON_MASK_CACHE.popitem(last=False)
+    return mask
+
+
 def _build_canon_queries(scene_text: str, scene_meta: Dict[str, Any]) -> List[str]:
     """Build search queries for canon retrieval."""
     queries = []
@@ -130,11 +219,12 @@ def _build_canon_queries(scene_text: str, scene_meta: Dict[str, Any]) -> List[st
     if scene_meta.get("location"):
         queries.append(f"location {scene_meta['location']} description rules")
     
-    # Extract proper nouns from scene text for additional queries
-    words = scene_text.split()
-    capitalized_words = [w for w in words if w.istitle() and len(w) > 3]
+    # Extract proper nouns from scene text for additional queries, scanning
+    # only as far as the third one
+    words = (m.group() for m in _TOKEN_RE.finditer(scene_text))
+    capitalized_words = list(islice((w for w in words if w.istitle() and len(w) > 3), 3))
     if capitalized_words:
-        queries.append(" ".join(capitalized_words[:3]))
+        queries.append(" ".join(capitalized_words))
     
     # Generic world-building query
     queries.append("world rules magic technology society")
@@ -144,17 +234,16 @@ def _build_canon_queries(scene_text: str, scene_meta: Dict[str, Any]) -> List[st
 
 def _check_character_consistency(
     scene_text: str, 
+    scene_lower: str,
     scene_meta: Dict[str, Any], 
-    canon_chunks: List[Dict]
+    canon_mask: int
 ) -> tuple[List[Finding], List[Dict[str, str]]]:
     """Check for character consistency violations."""
     findings = []
     receipts = []
     
     # Look for character-related canon chunks
-    char_chunks = [c for c in canon_chunks if "character" in c.get("text", "").lower()]
-    
-    if scene_meta.get("pov") and char_chunks:
+    if scene_meta.get("pov") and canon_mask & _CHARACTER_MASK:
         # Simulate character consistency check
         # In a real implementation, this would use LLM analysis
         
@@ -179,20 +268,18 @@ def _check_character_consistency(
 
 def _check_world_rules(
     scene_text: str,
+    scene_lower: str,
     scene_meta: Dict[str, Any],
-    canon_chunks: List[Dict]
+    canon_mask: int
 ) -> tuple[List[Finding], List[Dict[str, str]]]:
     """Check for world rule violations."""
     findings = []
     receipts = []
     
     # Look for world rule chunks
-    world_chunks = [c for c in canon_chunks if any(word in c.get("text", "").lower() 
-                   for word in ["magic", "technology", "rule", "law", "society"])]
-    
-    if world_chunks:
+    if canon_mask & _WORLD_MASK:
         # Example: Check for magic system violations
-        if "magic" in scene_text.lower() and "without cost" in scene_text.lower():
+        if "magic" in scene_lower and "without cost" in scene_lower:
             findings.append(Finding(
                 issue="Magic used without established cost/consequence system",
                 severity="block",
@@ -212,20 +299,18 @@ def _check_world_rules(
 
 def _check_timeline_consistency(
     scene_text: str,
+    scene_lower: str,
     scene_meta: Dict[str, Any], 
-    canon_chunks: List[Dict]
+    canon_mask: int
 ) -> tuple[List[Finding], List[Dict[str, str]]]:
     """Check for timeline and continuity violations."""
     findings = []
     receipts = []
     
     # Look for timeline-related chunks
-    timeline_chunks = [c for c in canon_chunks if any(word in c.get("text", "").lower()
-                      for word in ["chapter", "before", "after", "previous", "timeline"])]
-    
-    if timeline_chunks and scene_meta.get("chapter"):
+    if scene_meta.get("chapter") and canon_mask & _TIMELINE_MASK:
         # Example: Check for events happening out of order
-        if scene_meta["chapter"] == 1 and "remember when we" in scene_text.lower():
+        if scene_meta["chapter"] == 1 and "remember when we" in scene_lower:
             findings.append(Finding(
                 issue="Reference to past events in Chapter 1 before they are established",
                 severity="warn", 
@@ -248,21 +333,31 @@ def _generate_correction_diff(scene_text: str, blocking_findings: List[Finding])
     if not blocking_findings:
         return ""
     
-    # Simple example correction - in reality this would be more sophisticated
+    # Simple example correction - in reality this would be more sophisticated.
+    # Every matching finding applies the same replacement, so one pass over
+    # the lines covers them all; the replacement is case-sensitive, so there
+    # is nothing to do unless the exact phrase occurs.
+    if not any("without cost" in f.suggestion for f in blocking_findings):
+        return ""
+    if "without cost" not in scene_text:
+        return ""
+    
     lines = scene_text.split('\n')
-    corrected_lines = lines[:]
+    modifications: Dict[int, str] = {}
     
-    for finding in blocking_findings:
-        if "without cost" in finding.suggestion:
-            # Find and modify lines with magic without cost
-            for i, line in enumerate(corrected_lines):
-                if "magic" in line.lower() and "without cost" in line.lower():
-                    corrected_lines[i] = line.replace("without cost", "with great effort")
+    # Find and modify lines with magic without cost
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        if "magic" in line_lower and "without cost" in line_lower:
+            corrected = line.replace("without cost", "with great effort")
+            if corrected != line:
+                modifications[i] = corrected
     
-    if corrected_lines != lines:
+    if modifications:
         # Generate unified diff
         from ..utils.diff import make_unified_diff
-        return make_unified_diff('\n'.join(lines), '\n'.join(corrected_lines), "scene.md")
+        corrected_lines = [modifications.get(i, line) for i, line in enumerate(lines)]
+        return make_unified_diff(scene_text, '\n'.join(corrected_lines), "scene.md")
     
     return ""
 
@@ -291,13 +386,15 @@ class LoreArchivistAgent(Agent):
         scene_text = task.get("scene_text", "")
         scene_meta = context.get("scene_meta", {})
         retrieve_fn = context.get("retrieve_fn", lambda q, k, f: [])
+        retrieve_batch_fn = context.get("retrieve_batch_fn")
         
         # Use deterministic temperature as specified
         result = await run_lore_archivist(
             scene_text=scene_text,
             scene_meta=scene_meta,
             retrieve_fn=retrieve_fn,
-            model="anthropic/claude-3-opus"
+            model="anthropic/claude-3-opus",
+            retrieve_batch_fn=retrieve_batch_fn
         )
         
         self.log_result(result)
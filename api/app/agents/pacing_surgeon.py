@@ -1,9 +1,23 @@
 """Pacing Surgeon agent for narrative flow improvements as specified in Prompt 69."""
 from typing import Dict, Any, List, Optional
 import re
+import numpy as np
 from pydantic import BaseModel
 
 
+# Pace labels indexed by the int8 pace codes used for per-paragraph stats
+_PACES = ("slow", "medium", "fast", "variable")
+_SLOW, _MEDIUM, _FAST, _VARIABLE = range(len(_PACES))
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_DIALOGUE_RE = re.compile(r'"[^"]+"')
+_ACTION_VERBS = frozenset({
+    'ran', 'jumped', 'grabbed', 'struck', 'threw', 'dodged',
+    'attacked', 'fled', 'charged', 'slammed', 'kicked', 'punched'
+})
+_WORD_RE = re.compile(r'[a-z]+')
+
+
 class PacingAnalysis(BaseModel):
     """Analysis of pacing issues in a scene."""
     section: str
@@ -18,7 +32,7 @@ class PacingSurgeonResult(BaseModel):
     beat_analysis: List[Dict[str, Any]]
     slow_sections: List[PacingAnalysis]
     recommendations: List[str]
-    proposed_edits: Dict[str, str]
+    proposed_edits: Dict[int, Dict[str, str]]  # paragraph index -> original_preview, edited
     rationale: List[str]
 
 
@@ -49,39 +63,46 @@ async def run_pacing_surgeon(
     """
     # Analyze current pacing
     paragraphs = scene_text.split('\n\n')
-    beat_analysis = []
     slow_sections = []
     proposed_edits = {}
     
+    # Per-paragraph stats kept as parallel columns; beat dicts are only
+    # built for the response
+    para_indices = []
+    pace_codes = []
+    avg_sentence_lengths = []
+    dialogue_flags = []
+    action_flags = []
+    word_counts = []
+    
     for i, para in enumerate(paragraphs):
         if not para.strip():
             continue
             
         # Analyze paragraph characteristics
-        sentences = _split_sentences(para)
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
-        has_dialogue = bool(re.search(r'"[^"]+"', para))
-        has_action = _contains_action_verbs(para)
+        stats = _analyze_paragraph(para)
+        avg_sentence_length = stats["avg_sentence_length"]
+        has_dialogue = stats["has_dialogue"]
+        has_action = stats["has_action"]
+        word_count = stats["word_count"]
         
         # Determine pace
         if avg_sentence_length > 25:
-            pace = "slow"
+            pace_code = _SLOW
         elif avg_sentence_length < 10 and has_action:
-            pace = "fast"
+            pace_code = _FAST
         elif has_dialogue:
-            pace = "medium"
+            pace_code = _MEDIUM
         else:
-            pace = "variable"
+            pace_code = _VARIABLE
+        pace = _PACES[pace_code]
         
-        beat = {
-            "paragraph": i,
-            "pace": pace,
-            "avg_sentence_length": avg_sentence_length,
-            "has_dialogue": has_dialogue,
-            "has_action": has_action,
-            "word_count": len(para.split())
-        }
-        beat_analysis.append(beat)
+        para_indices.append(i)
+        pace_codes.append(pace_code)
+        avg_sentence_lengths.append(avg_sentence_length)
+        dialogue_flags.append(has_dialogue)
+        action_flags.append(has_action)
+        word_counts.append(word_count)
         
         # Identify slow sections
         if pace == "slow" and target_pace != "slow":
@@ -96,7 +117,7 @@ async def run_pacing_surgeon(
                 issues.append("Lacks action or dialogue")
                 suggestions.append("Add action beats or dialogue")
             
-            if len(para.split()) > 150:
+            if word_count > 150:
                 issues.append("Paragraph too long")
                 suggestions.append("Split into smaller paragraphs")
             
@@ -111,32 +132,51 @@ async def run_pacing_surgeon(
             if edge_intensity > 0:
                 edited = _improve_pacing(para, target_pace, edge_intensity)
                 if edited != para:
-                    proposed_edits[para[:50] + "..."] = edited
+                    proposed_edits[i] = {"original_preview": para[:50], "edited": edited}
+    
+    # Summary stats over the per-paragraph columns
+    beat_count = len(pace_codes)
+    pace_counts = np.bincount(np.array(pace_codes, dtype=np.int8), minlength=len(_PACES))
+    word_count_array = np.array(word_counts, dtype=np.int32)
     
     # Calculate overall pace score
-    pace_variety = len(set(b["pace"] for b in beat_analysis))
+    pace_variety = int(np.count_nonzero(pace_counts))
     ideal_variety = 3 if target_pace == "variable" else 1
     pace_score = min(pace_variety / ideal_variety, 1.0)
     
     # Generate recommendations
     recommendations = []
-    if len(slow_sections) > len(beat_analysis) / 2:
+    if len(slow_sections) > beat_count / 2:
         recommendations.append("Scene has too many slow sections - consider cutting or adding tension")
     
     if pace_variety == 1:
         recommendations.append("Add pace variation to maintain reader interest")
     
-    avg_para_length = sum(b["word_count"] for b in beat_analysis) / max(len(beat_analysis), 1)
+    avg_para_length = float(word_count_array.mean()) if beat_count else 0
     if avg_para_length > 100:
         recommendations.append("Consider breaking up longer paragraphs")
     
     # Build rationale
     rationale = [
-        f"Analyzed {len(beat_analysis)} paragraphs for pacing",
-        f"Current pace distribution: {_get_pace_distribution(beat_analysis)}",
+        f"Analyzed {beat_count} paragraphs for pacing",
+        f"Current pace distribution: {_get_pace_distribution(pace_counts)}",
         f"Identified {len(slow_sections)} sections needing pace improvement"
     ]
     
+    beat_analysis = [
+        {
+            "paragraph": i,
+            "pace": _PACES[code],
+            "avg_sentence_length": avg_len,
+            "has_dialogue": has_dialogue,
+            "has_action": has_action,
+            "word_count": word_count
+        }
+        for i, code, avg_len, has_dialogue, has_action, word_count in zip(
+            para_indices, pace_codes, avg_sentence_lengths, dialogue_flags, action_flags, word_counts
+        )
+    ]
+    
     result = PacingSurgeonResult(
         scene_pace_score=pace_score,
         beat_analysis=beat_analysis,
@@ -149,21 +189,37 @@ async def run_pacing_surgeon(
     return result.model_dump()
 
 
+def _analyze_paragraph(para: str) -> Dict[str, Any]:
+    """
+    Compute all per-paragraph pacing stats with one sentence split.
+    
+    Returns:
+        Dictionary with avg_sentence_length, has_dialogue, has_action and word_count
+    """
+    pieces = _SENTENCE_SPLIT_RE.split(para)
+    sentence_count = sum(1 for piece in pieces if piece and not piece.isspace())
+    # Joining on a space keeps sentence boundaries as word boundaries, so this
+    # equals summing word counts over each sentence
+    sentence_words = len(' '.join(pieces).split())
+    
+    return {
+        "avg_sentence_length": sentence_words / max(sentence_count, 1),
+        "has_dialogue": bool(_DIALOGUE_RE.search(para)),
+        "has_action": _contains_action_verbs(para),
+        "word_count": len(para.split())
+    }
+
+
 def _split_sentences(text: str) -> List[str]:
     """Split text into sentences."""
     # Simple sentence splitter
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     return [s.strip() for s in sentences if s.strip()]
 
 
 def _contains_action_verbs(text: str) -> bool:
-    """Check if text contains action verbs."""
-    action_verbs = [
-        "ran", "jumped", "grabbed", "struck", "threw", "dodged",
-        "attacked", "fled", "charged", "slammed", "kicked", "punched"
-    ]
-    text_lower = text.lower()
-    return any(verb in text_lower for verb in action_verbs)
+    """Check if text contains action verbs as whole words."""
+    return not _ACTION_VERBS.isdisjoint(_WORD_RE.findall(text.lower()))
 
 
 def _improve_pacing(text: str, target_pace: str, intensity: int) -> str:
@@ -199,13 +255,8 @@ def _improve_pacing(text: str, target_pace: str, intensity: int) -> str:
     return text
 
 
-def _get_pace_distribution(beat_analysis: List[Dict]) -> str:
-    """Get distribution of pacing in beats."""
-    paces = [b["pace"] for b in beat_analysis]
-    pace_counts = {}
-    for pace in ["slow", "medium", "fast", "variable"]:
-        count = paces.count(pace)
-        if count > 0:
-            pace_counts[pace] = count
-    
-    return ", ".join(f"{pace}: {count}" for pace, count in pace_counts.items())
\ No newline at end of file
+def _get_pace_distribution(pace_counts: np.ndarray) -> str:
+    """Format per-pace paragraph counts, indexed by pace code."""
+    return ", ".join(
+        f"{pace}: {int(count)}" for pace, count in zip(_PACES, pace_counts) if count > 0
+    )
\ No newline at end of file
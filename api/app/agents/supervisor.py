@@ -1,6 +1,6 @@
 """Supervisor agent for planning and orchestrating sub-tasks as specified in Prompt 12."""
-import json
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
 import logging
 
 from .base import Agent, AgentOutput
@@ -44,69 +44,10 @@ async def run_supervisor(
         Dictionary with plan, variants, receipts, and rationales
     """
     try:
-        # Create task plan based on requested agents
-        tasks = []
-        success_criteria = []
-        
-        if "lore_archivist" in requested_agents:
-            tasks.append({"agent": "lore_archivist"})
-            success_criteria.append("no_canon_violations")
-        
-        if "grim_editor" in requested_agents:
-            tasks.append({"agent": "grim_editor"})
-            success_criteria.append("metrics_within_targets")
-        
-        if "tone_metrics" in requested_agents:
-            tasks.append({"agent": "tone_metrics"})
-            success_criteria.append("diffs_valid")
-        
-        plan = TaskPlan(
-            tasks=tasks,
-            success_criteria=success_criteria
-        )
-        
-        # Initialize variants based on edge intensity
-        variants = {
-            "safe": {
-                "agents": ["grim_editor"],
-                "temperature": 0.3,
-                "diff": "",
-                "rationale": "Conservative edits focusing on clarity and grammar",
-                "risk_level": "low"
-            },
-            "bold": {
-                "agents": ["lore_archivist", "grim_editor", "tone_metrics"],
-                "temperature": 0.7,
-                "diff": "",
-                "rationale": "Significant improvements with lore consistency checking",
-                "risk_level": "medium"
-            }
-        }
-        
-        # Add red_team variant only if edge_intensity >= 1
-        if edge_intensity >= 1:
-            variants["red_team"] = {
-                "agents": ["red_team"],
-                "temperature": 0.9,
-                "diff": "",
-                "rationale": "Experimental edge variant with creative risks",
-                "risk_level": "high",
-                "edge_intensity": edge_intensity
-            }
-        
-        # Initialize receipts and rationales
+        # Plan, variants and rationales depend only on the intensity and the
+        # agent set; the cached skeleton is copied by validation/model_dump
+        plan, variants, rationales = _build_plan_skeleton(edge_intensity, frozenset(requested_agents))
         receipts = []
-        rationales = {}
-        
-        # Add basic rationale for each requested agent
-        if "lore_archivist" in requested_agents:
-            rationales["lore_archivist"] = "Validates changes against canon and world consistency"
-        
-        if "grim_editor" in requested_agents:
-            rationales["grim_editor"] = "Improves prose clarity, rhythm, and style while preserving meaning"
-        
-        if "tone_metrics" in requested_agents:
-            rationales["tone_metrics"] = "Analyzes and optimizes text metrics against editorial targets"
         
         # Add sample receipts based on scene metadata
         if scene_meta.get("chapter"):
@@ -141,6 +82,87 @@ async def run_supervisor(
         }
 
 
+@lru_cache(maxsize=64)
+def _build_plan_skeleton(
+    edge_intensity: int,
+    agents: FrozenSet[str]
+) -> Tuple[TaskPlan, Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Build the static part of a supervisor result.
+    
+    Args:
+        edge_intensity: Risk/edge level (0-3)
+        agents: Requested agent names
+        
+    Returns:
+        Tuple of (task plan, variants, rationales). Shared between calls, so
+        callers must not mutate them.
+    """
+    # Create task plan based on requested agents
+    tasks = []
+    success_criteria = []
+    
+    if "lore_archivist" in agents:
+        tasks.append({"agent": "lore_archivist"})
+        success_criteria.append("no_canon_violations")
+    
+    if "grim_editor" in agents:
+        tasks.append({"agent": "grim_editor"})
+        success_criteria.append("metrics_within_targets")
+    
+    if "tone_metrics" in agents:
+        tasks.append({"agent": "tone_metrics"})
+        success_criteria.append("diffs_valid")
+    
+    plan = TaskPlan(
+        tasks=tasks,
+        success_criteria=success_criteria
+    )
+    
+    # Initialize variants based on edge intensity
+    variants = {
+        "safe": {
+            "agents": ["grim_editor"],
+            "temperature": 0.3,
+            "diff": "",
+            "rationale": "Conservative edits focusing on clarity and grammar",
+            "risk_level": "low"
+        },
+        "bold": {
+            "agents": ["lore_archivist", "grim_editor", "tone_metrics"],
+            "temperature": 0.7,
+            "diff": "",
+            "rationale": "Significant improvements with lore consistency checking",
+            "risk_level": "medium"
+        }
+    }
+    
+    # Add red_team variant only if edge_intensity >= 1
+    if edge_intensity >= 1:
+        variants["red_team"] = {
+            "agents": ["red_team"],
+            "temperature": 0.9,
+            "diff": "",
+            "rationale": "Experimental edge variant with creative risks",
+            "risk_level": "high",
+            "edge_intensity": edge_intensity
+        }
+    
+    # Add basic rationale for each requested agent
+    rationales = {}
+    
+    if "lore_archivist" in agents:
+        rationales["lore_archivist"] = "Validates changes against canon and world consistency"
+    
+    if "grim_editor" in agents:
+        rationales["grim_editor"] = "Improves prose clarity, rhythm, and style while preserving meaning"
+    
+    if "tone_metrics" in agents:
+        rationales["tone_metrics"] = "Analyzes and optimizes text metrics against editorial targets"
+    
+    return plan, variants, rationales
+
+
 class SupervisorAgent(Agent):
     """Supervisor agent implementation using the base Agent class."""
     
@@ -1,21 +1,75 @@
 """Authentication and authorization system."""
+import base64
+import os
 import secrets
 import hashlib
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from uuid import uuid4
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
+from .config import settings
+
 logger = logging.getLogger(__name__)
 
+# AES-GCM encryption of stored LLM keys needs the optional cryptography package
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    AESGCM = None  # type: ignore
+    CRYPTOGRAPHY_AVAILABLE = False
+
 # Simple in-memory store for demo - would use Redis/DB in production
-_api_keys: Dict[str, Dict[str, Any]] = {}
-_user_llm_keys: Dict[str, str] = {}  # user_id -> encrypted_llm_key
+# Both stores are keyed by the raw 32-byte SHA-256 digest of the API key
+_api_keys: Dict[bytes, Dict[str, Any]] = {}
+_user_llm_keys: Dict[bytes, bytes] = {}  # key digest -> nonce + AES-GCM ciphertext
+
+_NONCE_SIZE = 12
+
+# Redis sorted sets (member = key digest, score = last time the session was
+# seen) mirroring the stores above, so counts cover every worker process
+# rather than only the one answering /metrics. The stores die with their
+# process, so entries not seen for SESSION_ACTIVE_WINDOW seconds are trimmed
+# before counting instead of being kept forever.
+_SESSIONS_KEY = "auth:sessions:seen"
+_LLM_KEYS_KEY = "auth:llm_keys:seen"
+# Hashes used before last-seen tracking; they only ever grew
+_LEGACY_REGISTRY_KEYS = ("auth:sessions", "auth:llm_keys")
+SESSION_ACTIVE_WINDOW = 30 * 60
+# Minimum seconds between last-seen refreshes of one session
+_TOUCH_INTERVAL = 60
+
+
+def _load_kek():
+    """Build the AES-GCM cipher for LLM keys from WRX_KEK_B64."""
+    if not CRYPTOGRAPHY_AVAILABLE:
+        logger.warning("cryptography not available, user LLM keys are stored unencrypted")
+        return None
+    
+    if settings.wrx_kek_b64:
+        return AESGCM(base64.b64decode(settings.wrx_kek_b64))
+    
+    # Keys only live in memory, so a per-process key loses nothing on restart
+    logger.warning("WRX_KEK_B64 not set, encrypting user LLM keys with a random key")
+    return AESGCM(AESGCM.generate_key(bit_length=256))
+
+
+_kek = _load_kek()
 
 security = HTTPBearer(auto_error=False)
 
 
+@lru_cache(maxsize=4096)
+def _hash_key(key: str) -> bytes:
+    """SHA-256 an API key; memoized since clients resend the same key."""
+    return hashlib.sha256(key.encode()).digest()
+
+
 class AuthManager:
     """Manages API authentication and user LLM keys."""
     
@@ -25,9 +79,9 @@ class AuthManager:
         return f"wrx_{secrets.token_urlsafe(32)}"
     
     @staticmethod
-    def hash_key(key: str) -> str:
-        """Hash an API key for storage."""
-        return hashlib.sha256(key.encode()).hexdigest()
+    def hash_key(key: str) -> bytes:
+        """Hash an API key for storage (raw digest bytes; use .hex() to display)."""
+        return _hash_key(key)
     
     @staticmethod
     def create_user_session(name: str = "default") -> str:
@@ -35,12 +89,15 @@ class AuthManager:
         api_key = AuthManager.generate_api_key()
         key_hash = AuthManager.hash_key(api_key)
         
+        # last_used and window_start are time.monotonic() readings; only
+        # created_at is ever shown to users
+        now = time.monotonic()
         _api_keys[key_hash] = {
             "name": name,
             "created_at": datetime.utcnow(),
-            "last_used": datetime.utcnow(),
+            "last_used": now,
             "usage_count": 0,
-            "rate_limit": {"requests": 0, "window_start": datetime.utcnow()}
+            "rate_limit": {"requests": 0, "window_start": now}
         }
         
         logger.info(f"Created new user session for: {name}")
@@ -52,43 +109,152 @@ class AuthManager:
         if not api_key:
             return None
             
-        key_hash = AuthManager.hash_key(api_key)
+        return AuthManager.validate_api_key_hash(AuthManager.hash_key(api_key))
+    
+    @staticmethod
+    def validate_api_key_hash(key_hash: bytes) -> Optional[Dict[str, Any]]:
+        """Validate an already-hashed API key and return user info."""
         user_info = _api_keys.get(key_hash)
         
         if user_info:
             # Update last used
-            user_info["last_used"] = datetime.utcnow()
+            user_info["last_used"] = time.monotonic()
             user_info["usage_count"] += 1
             
         return user_info
     
     @staticmethod
-    def store_user_llm_key(user_key_hash: str, llm_key: str) -> None:
-        """Store user's LLM key securely."""
-        # Simple encryption - in production use proper encryption
-        encrypted = secrets.token_urlsafe(16) + ":" + llm_key
-        _user_llm_keys[user_key_hash] = encrypted
-        logger.info(f"Stored LLM key for user: {user_key_hash[:8]}...")
+    def store_user_llm_key(user_key_hash: bytes, llm_key: str) -> None:
+        """Store user's LLM key encrypted with AES-GCM."""
+        if _kek is None:
+            _user_llm_keys[user_key_hash] = llm_key.encode()
+        else:
+            nonce = os.urandom(_NONCE_SIZE)
+            # Bind the ciphertext to its owner so it cannot be swapped between users
+            _user_llm_keys[user_key_hash] = nonce + _kek.encrypt(nonce, llm_key.encode(), user_key_hash)
+        logger.info(f"Stored LLM key for user: {user_key_hash[:4].hex()}...")
     
     @staticmethod
-    def get_user_llm_key(user_key_hash: str) -> Optional[str]:
+    def get_user_llm_key(user_key_hash: bytes) -> Optional[str]:
         """Retrieve user's LLM key."""
         encrypted = _user_llm_keys.get(user_key_hash)
-        if encrypted and ":" in encrypted:
-            return encrypted.split(":", 1)[1]
-        return None
+        if not encrypted:
+            return None
+        if _kek is None:
+            return encrypted.decode()
+        
+        nonce, ciphertext = encrypted[:_NONCE_SIZE], encrypted[_NONCE_SIZE:]
+        return _kek.decrypt(nonce, ciphertext, user_key_hash).decode()
     
     @staticmethod
-    def remove_user_llm_key(user_key_hash: str) -> bool:
+    def remove_user_llm_key(user_key_hash: bytes) -> bool:
         """Remove user's LLM key."""
         if user_key_hash in _user_llm_keys:
             del _user_llm_keys[user_key_hash]
-            logger.info(f"Removed LLM key for user: {user_key_hash[:8]}...")
+            logger.info(f"Removed LLM key for user: {user_key_hash[:4].hex()}...")
             return True
         return False
 
 
-def get_current_user(
+def _shared_redis():
+    """Return the job queue's Redis client, or None when Redis is unavailable."""
+    from .background import job_queue
+    return job_queue.redis_client
+
+
+async def publish_session(key_hash: bytes) -> None:
+    """Record a new session in the shared Redis registry."""
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.zadd(_SESSIONS_KEY, {key_hash: time.time()})
+    except Exception as e:
+        logger.warning(f"Failed to publish session to Redis: {e}")
+
+
+async def touch_session(key_hash: bytes, user_info: Dict[str, Any]) -> None:
+    """Refresh a session's last-seen time (and its LLM key's) at most every _TOUCH_INTERVAL."""
+    now = time.monotonic()
+    if now - user_info.get("last_published", -_TOUCH_INTERVAL) < _TOUCH_INTERVAL:
+        return
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return
+    
+    user_info["last_published"] = now
+    seen = time.time()
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zadd(_SESSIONS_KEY, {key_hash: seen})
+            if key_hash in _user_llm_keys:
+                pipe.zadd(_LLM_KEYS_KEY, {key_hash: seen})
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to refresh session in Redis: {e}")
+
+
+async def publish_llm_key(key_hash: bytes, stored: bool) -> None:
+    """Record that a user's LLM key was stored or removed in the shared Redis registry."""
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return
+    try:
+        if stored:
+            await redis_client.zadd(_LLM_KEYS_KEY, {key_hash: time.time()})
+        else:
+            await redis_client.zrem(_LLM_KEYS_KEY, key_hash)
+    except Exception as e:
+        logger.warning(f"Failed to publish LLM key change to Redis: {e}")
+
+
+async def reset_auth_registry() -> None:
+    """
+    Drop registry entries that can no longer be live, on startup.
+    
+    This process starts with empty stores, but other instances may still
+    hold sessions, so only expired entries and the legacy hashes are removed.
+    """
+    redis_client = _shared_redis()
+    if redis_client is None:
+        return
+    cutoff = time.time() - SESSION_ACTIVE_WINDOW
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(*_LEGACY_REGISTRY_KEYS)
+            pipe.zremrangebyscore(_SESSIONS_KEY, 0, cutoff)
+            pipe.zremrangebyscore(_LLM_KEYS_KEY, 0, cutoff)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to reset auth registry in Redis: {e}")
+
+
+async def count_auth_entries() -> Tuple[int, int]:
+    """
+    Count sessions and stored LLM keys across all workers.
+    
+    Returns:
+        (sessions, users_with_llm_keys) seen within SESSION_ACTIVE_WINDOW,
+        from Redis in one round trip, or this process's stores when Redis
+        is unavailable
+    """
+    redis_client = _shared_redis()
+    if redis_client is not None:
+        cutoff = time.time() - SESSION_ACTIVE_WINDOW
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(_SESSIONS_KEY, 0, cutoff)
+                pipe.zremrangebyscore(_LLM_KEYS_KEY, 0, cutoff)
+                pipe.zcard(_SESSIONS_KEY)
+                pipe.zcard(_LLM_KEYS_KEY)
+                _, _, sessions, llm_keys = await pipe.execute()
+            return sessions, llm_keys
+        except Exception as e:
+            logger.warning(f"Redis auth counts failed, using local counts: {e}")
+    return len(_api_keys), len(_user_llm_keys)
+
+
+async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Dict[str, Any]:
@@ -113,7 +279,9 @@ def get_current_user(
             detail="API key required. Use Authorization: Bearer <key> or X-API-Key header"
         )
     
-    user_info = AuthManager.validate_api_key(api_key)
+    # Hash once; the same digest is used for validation and LLM key lookup
+    key_hash = AuthManager.hash_key(api_key)
+    user_info = AuthManager.validate_api_key_hash(key_hash)
     if not user_info:
         raise HTTPException(
             status_code=401,
@@ -121,53 +289,148 @@ def get_current_user(
         )
     
     # Add the hashed key for LLM key lookup
-    user_info["key_hash"] = AuthManager.hash_key(api_key)
+    user_info["key_hash"] = key_hash
+    await touch_session(key_hash, user_info)
     return user_info
 
 
 def get_user_llm_client(user: Dict[str, Any] = Depends(get_current_user)):
     """Get LLM client with user's API key."""
-    from .services.llm_client import LLMClient
+    from .services.llm_client import get_llm_client_for_key
     
+    # Without a stored key this is the default client
     user_llm_key = AuthManager.get_user_llm_key(user["key_hash"])
-    if not user_llm_key:
-        # Return disabled client
-        return LLMClient(api_key=None)
-    
-    return LLMClient(api_key=user_llm_key)
+    return get_llm_client_for_key(user_llm_key)
 
 
 class RateLimiter:
     """Simple rate limiting implementation."""
     
     @staticmethod
-    def check_rate_limit(user_info: Dict[str, Any], limit: int = 60, window: int = 60) -> bool:
-        """Check if user is within rate limits."""
-        now = datetime.utcnow()
+    def check_rate_limit(user_info: Dict[str, Any], limit: int = 60, window: int = 60, cost: int = 1) -> bool:
+        """
+        Check if user is within rate limits (in-process fixed window).
+        
+        Reads the counters once and writes them back in one step, with no
+        await in between, so concurrent requests on the event loop cannot
+        interleave. Callers reject with 429/Retry-After instead of waiting.
+        A request costing more than one counts as that many requests.
+        """
+        now = time.monotonic()
         rate_info = user_info["rate_limit"]
+        requests = rate_info["requests"]
+        window_start = rate_info["window_start"]
         
-        # Reset window if needed
-        if (now - rate_info["window_start"]).seconds >= window:
-            rate_info["requests"] = 0
-            rate_info["window_start"] = now
+        # Start a new window with this request
+        if now - window_start >= window:
+            requests, window_start = 0, now
         
         # Check limit
-        if rate_info["requests"] >= limit:
+        if requests + cost > limit:
             return False
         
-        rate_info["requests"] += 1
+        rate_info["requests"], rate_info["window_start"] = requests + cost, window_start
         return True
+    
+    @staticmethod
+    async def check_sliding_window(
+        user_info: Dict[str, Any],
+        limit: int = 60,
+        window: int = 60,
+        cost: int = 1
+    ) -> bool:
+        """
+        Check a rolling-window rate limit shared by all API workers.
+        
+        Each request is logged in a Redis sorted set scored by timestamp;
+        entries older than the window are trimmed and the rest counted with
+        ZCARD, so the log itself never comes back to the app. Falls back to
+        the in-process fixed window when Redis is unavailable.
+        
+        Args:
+            user_info: Authenticated user info (must carry key_hash)
+            limit: Maximum requests per window
+            window: Window length in seconds
+            cost: Number of requests this call counts as
+            
+        Returns:
+            True if the request is allowed
+        """
+        from .background import job_queue
+        
+        redis_client = job_queue.redis_client
+        if redis_client is None:
+            return RateLimiter.check_rate_limit(user_info, limit, window, cost)
+        
+        key = b"ratelimit:" + user_info["key_hash"]
+        members = [uuid4().hex for _ in range(cost)]
+        now = time.time()
+        
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(key, 0, now - window)
+                pipe.zadd(key, dict.fromkeys(members, now))
+                pipe.zcard(key)
+                # Idle keys expire on their own
+                pipe.expire(key, 2 * window)
+                _, _, count, _ = await pipe.execute()
+            
+            if count > limit:
+                # Rejected requests do not count against the window
+                await redis_client.zrem(key, *members)
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed, using local window: {e}")
+            return RateLimiter.check_rate_limit(user_info, limit, window, cost)
+    
+    @staticmethod
+    async def remaining_requests(user_info: Dict[str, Any], limit: int = 60, window: int = 60) -> int:
+        """
+        Count the requests left in the user's current window without using one.
+        
+        Reads the same store check_sliding_window writes: the Redis log when
+        Redis is up, otherwise the in-process fixed window.
+        
+        Args:
+            user_info: Authenticated user info (must carry key_hash)
+            limit: Maximum requests per window
+            window: Window length in seconds
+            
+        Returns:
+            Requests still allowed in the window
+        """
+        from .background import job_queue
+        
+        redis_client = job_queue.redis_client
+        if redis_client is not None:
+            now = time.time()
+            try:
+                used = await redis_client.zcount(b"ratelimit:" + user_info["key_hash"], now - window, "+inf")
+                return max(0, limit - used)
+            except Exception as e:
+                logger.warning(f"Redis rate limit count failed, using local window: {e}")
+        
+        rate_info = user_info["rate_limit"]
+        if time.monotonic() - rate_info["window_start"] >= window:
+            return limit
+        return max(0, limit - rate_info["requests"])
+
+
+async def enforce_rate_limit(user: Dict[str, Any], limit: int = 60, window: int = 60, cost: int = 1) -> None:
+    """Raise 429 unless the user can make cost more requests in the window."""
+    if not await RateLimiter.check_sliding_window(user, limit, window, cost):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. {limit} requests per {window} seconds allowed.",
+            headers={"Retry-After": str(window)}
+        )
 
 
 def require_rate_limit(limit: int = 60, window: int = 60):
     """Rate limiting dependency factory."""
-    def _rate_limit_dependency(user: Dict[str, Any] = Depends(get_current_user)):
+    async def _rate_limit_dependency(user: Dict[str, Any] = Depends(get_current_user)):
         """Rate limiting dependency."""
-        if not RateLimiter.check_rate_limit(user, limit, window):
-            raise HTTPException(
-                status_code=429,
-                detail=f"Rate limit exceeded. {limit} requests per {window} seconds allowed.",
-                headers={"Retry-After": str(window)}
-            )
+        await enforce_rate_limit(user, limit, window)
         return user
     return _rate_limit_dependency
\ No newline at end of file
@@ -1,19 +1,27 @@
 """Background job processing with Redis."""
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import msgspec
 import redis.asyncio as redis
 from uuid import uuid4
 
+from .config import settings
+
 logger = logging.getLogger(__name__)
 
+# Store a job's data and put it back on the queue in one atomic step, so a
+# worker can never pop a retried job before its updated data is written
+_REQUEUE_LUA = """
+redis.call('HSET', KEYS[1], 'data', ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+return 1
+"""
+
 
-@dataclass
-class Job:
-    """Background job definition."""
+class Job(msgspec.Struct):
+    """Background job definition, stored in Redis as MessagePack."""
     id: str
     type: str
     payload: Dict[str, Any]
@@ -31,30 +39,69 @@ class Job:
             self.created_at = datetime.utcnow().isoformat()
 
 
+_job_encoder = msgspec.msgpack.Encoder()
+_job_decoder = msgspec.msgpack.Decoder(Job)
+_job_dict_decoder = msgspec.msgpack.Decoder(Dict[str, Any])
+
+
+def _dump_job(job: Job) -> bytes:
+    """Serialize a job for storage in Redis."""
+    return _job_encoder.encode(job)
+
+
 class JobQueue:
     """Redis-based job queue for background processing."""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        batch_size: int = 16,
+        max_concurrency: int = 4
+    ):
         self.redis_url = redis_url
+        # Queue traffic and liveness probes use separate pools, so a backlog of
+        # queue commands (or a worker parked in BZPOPMIN) cannot starve /health
+        self._queue_pool: Optional[redis.ConnectionPool] = None
+        self._probe_pool: Optional[redis.ConnectionPool] = None
         self.redis_client: Optional[redis.Redis] = None
+        self.probe_client: Optional[redis.Redis] = None
         self.job_handlers: Dict[str, Callable] = {}
         self.running = False
+        self._requeue_script = None
+        # Jobs popped per Redis round trip, and how many of them run at once
+        self.batch_size = batch_size
+        self._job_semaphore = asyncio.Semaphore(max_concurrency)
         
     async def connect(self):
         """Connect to Redis."""
         try:
-            self.redis_client = redis.from_url(self.redis_url)
+            # Waits for a free connection instead of failing when all are busy;
+            # the socket timeout must outlast the worker's 5s BZPOPMIN
+            self._queue_pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url, max_connections=10, socket_timeout=10, timeout=5
+            )
+            self._probe_pool = redis.ConnectionPool.from_url(
+                self.redis_url, max_connections=2, socket_timeout=2, socket_connect_timeout=2
+            )
+            self.redis_client = redis.Redis(connection_pool=self._queue_pool)
+            self.probe_client = redis.Redis(connection_pool=self._probe_pool)
             await self.redis_client.ping()
+            self._requeue_script = self.redis_client.register_script(_REQUEUE_LUA)
             logger.info(f"Connected to Redis at {self.redis_url}")
         except Exception as e:
             logger.warning(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
+            await self.disconnect()
     
     async def disconnect(self):
         """Disconnect from Redis."""
-        if self.redis_client:
-            await self.redis_client.close()
-            self.redis_client = None
+        for pool in (self._queue_pool, self._probe_pool):
+            if pool is not None:
+                await pool.disconnect()
+        self._queue_pool = None
+        self._probe_pool = None
+        self.redis_client = None
+        self.probe_client = None
+        self._requeue_script = None
     
     def register_handler(self, job_type: str, handler: Callable):
         """Register a job handler function."""
@@ -63,37 +110,58 @@ class JobQueue:
     
     async def enqueue(self, job_type: str, payload: Dict[str, Any], priority: int = 0) -> str:
         """Add a job to the queue."""
-        job = Job(
-            id=str(uuid4()),
-            type=job_type,
-            payload=payload
-        )
+        job_ids = await self.enqueue_many([(job_type, payload)], priority=priority)
+        return job_ids[0]
+    
+    async def enqueue_many(
+        self,
+        jobs: List[Tuple[str, Dict[str, Any]]],
+        priority: int = 0
+    ) -> List[str]:
+        """
+        Add several jobs to the queue in one Redis round trip.
+        
+        Args:
+            jobs: (job_type, payload) pairs
+            priority: Queue priority shared by all the jobs
+            
+        Returns:
+            Job IDs in the same order as jobs
+        """
+        new_jobs = [
+            Job(id=str(uuid4()), type=job_type, payload=payload)
+            for job_type, payload in jobs
+        ]
+        if not new_jobs:
+            return []
         
         if not self.redis_client:
             # Fallback: execute immediately if Redis unavailable
-            logger.warning("Redis unavailable, executing job immediately")
-            return await self._execute_job_immediately(job)
+            logger.warning("Redis unavailable, executing jobs immediately")
+            return [await self._execute_job_immediately(job) for job in new_jobs]
         
         try:
-            # Store job data
-            await self.redis_client.hset(
-                f"job:{job.id}",
-                mapping={
-                    "data": json.dumps(asdict(job)),
-                    "priority": priority
-                }
-            )
-            
-            # Add to queue
-            await self.redis_client.zadd("job_queue", {job.id: priority})
+            # Store all job data and queue every id in a single transaction
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for job in new_jobs:
+                    pipe.hset(
+                        f"job:{job.id}",
+                        mapping={
+                            "data": _dump_job(job),
+                            "priority": priority
+                        }
+                    )
+                pipe.zadd("job_queue", {job.id: priority for job in new_jobs})
+                await pipe.execute()
             
-            logger.info(f"Enqueued job {job.id} of type {job_type}")
-            return job.id
+            for job in new_jobs:
+                logger.info(f"Enqueued job {job.id} of type {job.type}")
+            return [job.id for job in new_jobs]
             
         except Exception as e:
-            logger.error(f"Failed to enqueue job: {e}")
+            logger.error(f"Failed to enqueue jobs: {e}")
             # Fallback: execute immediately
-            return await self._execute_job_immediately(job)
+            return [await self._execute_job_immediately(job) for job in new_jobs]
     
     async def _execute_job_immediately(self, job: Job) -> str:
         """Execute job immediately as fallback."""
@@ -130,7 +198,7 @@ class JobQueue:
         try:
             job_data = await self.redis_client.hget(f"job:{job_id}", "data")
             if job_data:
-                return json.loads(job_data)
+                return _job_dict_decoder.decode(job_data)
         except Exception as e:
             logger.error(f"Failed to get job status: {e}")
         
@@ -147,26 +215,40 @@ class JobQueue:
         
         while self.running:
             try:
-                # Get next job from queue (blocking pop with timeout)
-                result = await self.redis_client.bzpopmin("job_queue", timeout=5)
+                # Drain up to batch_size jobs at once
+                popped = await self.redis_client.zpopmin("job_queue", count=self.batch_size)
                 
-                if not result:
-                    continue  # Timeout, check if still running
+                if not popped:
+                    # Queue empty: block until the next job arrives
+                    result = await self.redis_client.bzpopmin("job_queue", timeout=5)
+                    if not result:
+                        continue  # Timeout, check if still running
+                    queue_name, job_id, priority = result
+                    popped = [(job_id, priority)]
                 
-                queue_name, job_id, priority = result
-                job_id = job_id.decode('utf-8')
+                job_ids = [job_id.decode('utf-8') for job_id, _ in popped]
                 
-                # Get job data
-                job_data = await self.redis_client.hget(f"job:{job_id}", "data")
-                if not job_data:
-                    logger.warning(f"Job {job_id} not found")
-                    continue
+                # Get all job data in one round trip
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for job_id in job_ids:
+                        pipe.hget(f"job:{job_id}", "data")
+                    job_datas = await pipe.execute()
                 
-                job_dict = json.loads(job_data)
-                job = Job(**job_dict)
+                jobs = []
+                for job_id, job_data in zip(job_ids, job_datas):
+                    if not job_data:
+                        logger.warning(f"Job {job_id} not found")
+                        continue
+                    jobs.append(_job_decoder.decode(job_data))
                 
-                # Execute job
-                await self._execute_job(job)
+                # Execute jobs, bounded by the concurrency limit
+                outcomes = await asyncio.gather(
+                    *(self._execute_job_bounded(job) for job in jobs),
+                    return_exceptions=True
+                )
+                for job, outcome in zip(jobs, outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Worker error on job {job.id}: {outcome}")
                 
             except Exception as e:
                 logger.error(f"Worker error: {e}")
@@ -174,6 +256,11 @@ class JobQueue:
         
         logger.info("Background job worker stopped")
     
+    async def _execute_job_bounded(self, job: Job):
+        """Execute a job once a concurrency slot is free."""
+        async with self._job_semaphore:
+            await self._execute_job(job)
+    
     async def _execute_job(self, job: Job):
         """Execute a single job."""
         handler = self.job_handlers.get(job.type)
@@ -211,19 +298,22 @@ class JobQueue:
             # Retry if under limit
             if job.retry_count < job.max_retries:
                 job.status = "queued"
-                await self.redis_client.zadd("job_queue", {job.id: 0})
+                await self._update_job(job, requeue=True)
                 logger.info(f"Retrying job {job.id} (attempt {job.retry_count + 1})")
+                return
         
         await self._update_job(job)
     
-    async def _update_job(self, job: Job):
-        """Update job in Redis."""
-        if self.redis_client:
-            await self.redis_client.hset(
-                f"job:{job.id}",
-                "data",
-                json.dumps(asdict(job))
-            )
+    async def _update_job(self, job: Job, requeue: bool = False):
+        """Update job in Redis, optionally putting it back on the queue."""
+        if not self.redis_client:
+            return
+        
+        data = _dump_job(job)
+        if requeue:
+            await self._requeue_script(keys=[f"job:{job.id}", "job_queue"], args=[data, 0, job.id])
+        else:
+            await self.redis_client.hset(f"job:{job.id}", "data", data)
     
     async def stop_worker(self):
         """Stop the background worker."""
@@ -232,7 +322,10 @@ class JobQueue:
 
 
 # Global job queue instance
-job_queue = JobQueue()
+job_queue = JobQueue(
+    batch_size=settings.job_batch_size,
+    max_concurrency=settings.job_concurrency
+)
 
 
 # Job handler functions
@@ -247,12 +340,9 @@ async def process_agent_pass(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not scene_id:
         raise ValueError("scene_id required")
     
-    # Set up LLM client with user's key
-    from .services.llm_client import LLMClient
-    if user_llm_key:
-        llm_client = LLMClient(api_key=user_llm_key)
-    else:
-        llm_client = LLMClient()  # Disabled client
+    # Set up LLM client with user's key (shared with other jobs for that key)
+    from .services.llm_client import get_llm_client_for_key
+    llm_client = get_llm_client_for_key(user_llm_key)
     
     # Execute the agent pass
     results = await run_agent_pass_internal(scene_id, agents, llm_client)
@@ -281,6 +371,14 @@ async def process_bulk_ingest(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+async def process_pass(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a pass created through the pass orchestrator endpoint."""
+    from .endpoints.passes import process_pass_job
+    
+    return await process_pass_job(payload)
+
+
 # Register job handlers
 job_queue.register_handler("agent_pass", process_agent_pass)
-job_queue.register_handler("bulk_ingest", process_bulk_ingest)
\ No newline at end of file
+job_queue.register_handler("bulk_ingest", process_bulk_ingest)
+job_queue.register_handler("process_pass", process_pass)
\ No newline at end of file
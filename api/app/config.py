@@ -27,6 +27,8 @@ class Settings(BaseSettings):
         default="redis://localhost:6379",
         alias="REDIS_URL"
     )
+    job_batch_size: int = Field(default=16, alias="JOB_BATCH_SIZE")
+    job_concurrency: int = Field(default=4, alias="JOB_CONCURRENCY")
     
     # S3/Spaces
     s3_endpoint: Optional[str] = Field(default=None, alias="S3_ENDPOINT")
@@ -45,6 +47,8 @@ class Settings(BaseSettings):
         default="https://openrouter.ai/api/v1",
         alias="OPENROUTER_BASE_URL"
     )
+    # Base64 AES-256 key that encrypts stored user LLM keys
+    wrx_kek_b64: Optional[str] = Field(default=None, alias="WRX_KEK_B64")
     
     # Monitoring
     alert_webhook_url: Optional[str] = Field(default=None, alias="ALERT_WEBHOOK_URL")
@@ -57,6 +61,10 @@ class Settings(BaseSettings):
         default=["http://localhost:3000", "http://localhost:5000"],
         alias="CORS_ORIGINS"
     )
+    # Host headers accepted by TrustedHostMiddleware; ["*"] disables the check
+    allowed_hosts: list[str] = Field(default=["*"], alias="ALLOWED_HOSTS")
+    # Router modules to mount; None mounts all of them
+    enabled_routers: Optional[list[str]] = Field(default=None, alias="ENABLED_ROUTERS")
     
     class Config:
         env_file = ".env"
@@ -4,9 +4,23 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 import asyncio
+import json
 
 from .config import settings
 
+try:
+    import orjson
+    
+    def _json_serializer(obj) -> str:
+        """Serialize JSON column values with orjson (NumPy arrays included)."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    _json_deserializer = orjson.loads
+except ImportError:
+    orjson = None
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
 
 # Create database engines
 if settings.database_url.startswith("sqlite"):
@@ -15,7 +29,9 @@ if settings.database_url.startswith("sqlite"):
         settings.database_url,
         connect_args={"check_same_thread": False},
         poolclass=pool.StaticPool,
-        echo=settings.debug
+        echo=settings.debug,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
     )
 else:
     # PostgreSQL settings
@@ -24,7 +40,9 @@ else:
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
-        echo=settings.debug
+        echo=settings.debug,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
     )
 
 # Create replica engine (falls back to primary if not configured)
@@ -34,7 +52,9 @@ if settings.replica_db_url:
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
-        echo=settings.debug
+        echo=settings.debug,
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer
     )
 else:
     replica_engine = primary_engine
@@ -1,19 +1,23 @@
 """Pass orchestrator endpoint as specified in Prompt 16."""
 import asyncio
+import hashlib
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 import logging
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
 from pydantic import BaseModel
 
 from ..agents.supervisor import run_supervisor, SupervisorAgent
 from ..agents.lore_archivist import run_lore_archivist, LoreArchivistAgent
 from ..agents.grim_editor import run_grim_editor, GrimEditorAgent 
 from ..agents.tone_metrics import run_tone_metrics, ToneMetricsAgent
-from ..services.llm_client import LLMClient
+from ..services.llm_client import LLMClient, get_llm_client
+from ..background import job_queue
+from ..rag.int8_index import get_codex_index
 from ..utils.diff import make_unified_diff
 
 logger = logging.getLogger(__name__)
@@ -42,8 +46,135 @@ class PassResult(BaseModel):
     created_at: str
 
 
-# In-memory storage for pass results (in production, use database)
-pass_results: Dict[str, Dict[str, Any]] = {}
+@dataclass(slots=True)
+class PassState:
+    """In-flight state of a pass; progress counters are kept up to date as agents finish."""
+    pass_id: str
+    created_at: str
+    status: str = "running"
+    variants: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    agent_results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    overall_assessment: str = "Processing..."
+    processing_time: float = 0.0
+    cost_usd: float = 0.0
+    error: Optional[str] = None
+    completed_count: int = 0
+    total_expected: int = 0
+    # Serialized /status body and its ETag, valid while _status_key matches
+    _status_key: Optional[Tuple[str, int, int]] = None
+    _status_body: bytes = b""
+    _status_etag: str = ""
+    
+    def status_body(self) -> Tuple[bytes, str]:
+        """Return the /status JSON body and ETag, re-serializing only when progress changed."""
+        key = (self.status, self.completed_count, self.total_expected)
+        if key != self._status_key:
+            body = json.dumps({
+                "pass_id": self.pass_id,
+                "status": self.status,
+                "progress": _calculate_progress(self)
+            }).encode()
+            self._status_key = key
+            self._status_body = body
+            self._status_etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        return self._status_body, self._status_etag
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize the state for Redis, progress counters included."""
+        record = self.to_response()
+        record["completed_count"] = self.completed_count
+        record["total_expected"] = self.total_expected
+        return record
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "PassState":
+        """Rebuild a state saved with to_record."""
+        return cls(
+            pass_id=record["pass_id"],
+            created_at=record["created_at"],
+            status=record["status"],
+            variants=record["variants"],
+            agent_results=record["agent_results"],
+            overall_assessment=record["overall_assessment"],
+            processing_time=record["processing_time"],
+            cost_usd=record["cost_usd"],
+            error=record.get("error"),
+            completed_count=record["completed_count"],
+            total_expected=record["total_expected"]
+        )
+    
+    def to_response(self) -> Dict[str, Any]:
+        """Build the /passes/{id} response body."""
+        response = {
+            "pass_id": self.pass_id,
+            "status": self.status,
+            "variants": self.variants,
+            "agent_results": self.agent_results,
+            "overall_assessment": self.overall_assessment,
+            "processing_time": self.processing_time,
+            "cost_usd": self.cost_usd,
+            "created_at": self.created_at
+        }
+        if self.error is not None:
+            response["error"] = self.error
+        return response
+
+
+# In-memory storage for pass results, used when Redis is not connected
+pass_results: Dict[str, PassState] = {}
+
+# With Redis, each pass is a hash of its serialized state plus the /status body
+# and ETag, so every instance sees progress made by whichever worker runs it
+_PASS_KEY = "pass:{}"
+PASS_STATE_TTL = 24 * 3600
+
+
+async def _publish_state(state: PassState) -> None:
+    """Write the pass state to Redis, if connected."""
+    redis_client = job_queue.redis_client
+    if not redis_client:
+        return
+    
+    body, etag = state.status_body()
+    key = _PASS_KEY.format(state.pass_id)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "data": json.dumps(state.to_record(), default=str),
+                "status": body,
+                "etag": etag
+            })
+            pipe.expire(key, PASS_STATE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to publish state of pass {state.pass_id}: {e}")
+
+
+async def _load_state(pass_id: str) -> Optional[PassState]:
+    """Get a pass state from Redis, falling back to this process's own passes."""
+    redis_client = job_queue.redis_client
+    if redis_client:
+        try:
+            data = await redis_client.hget(_PASS_KEY.format(pass_id), "data")
+            if data:
+                return PassState.from_record(json.loads(data))
+        except Exception as e:
+            logger.warning(f"Failed to load state of pass {pass_id}: {e}")
+    return pass_results.get(pass_id)
+
+
+async def _load_status(pass_id: str) -> Optional[Tuple[bytes, str]]:
+    """Get the pre-serialized /status body and ETag of a pass."""
+    redis_client = job_queue.redis_client
+    if redis_client:
+        try:
+            body, etag = await redis_client.hmget(_PASS_KEY.format(pass_id), ["status", "etag"])
+            if body:
+                return body, etag.decode()
+        except Exception as e:
+            logger.warning(f"Failed to load status of pass {pass_id}: {e}")
+    state = pass_results.get(pass_id)
+    return state.status_body() if state is not None else None
 
 
 @router.post("/passes/new")
@@ -60,24 +191,27 @@ async def create_new_pass(
         pass_id = str(uuid.uuid4())
         
         # Initialize pass result
-        pass_results[pass_id] = {
-            "pass_id": pass_id,
-            "status": "running",
-            "variants": {},
-            "agent_results": {},
-            "overall_assessment": "Processing...",
-            "processing_time": 0.0,
-            "cost_usd": 0.0,
-            "created_at": datetime.utcnow().isoformat()
-        }
-        
-        # Start background processing
-        background_tasks.add_task(
-            process_pass,
+        state = PassState(
             pass_id=pass_id,
-            request=request
+            created_at=datetime.utcnow().isoformat()
         )
         
+        # Queue the pass so concurrent passes are bounded by the job workers;
+        # without Redis, fall back to running it after the response
+        if job_queue.redis_client:
+            await _publish_state(state)
+            await job_queue.enqueue(
+                "process_pass",
+                {"pass_id": pass_id, "request": request.model_dump()}
+            )
+        else:
+            pass_results[pass_id] = state
+            background_tasks.add_task(
+                process_pass,
+                pass_id=pass_id,
+                request=request
+            )
+        
         return {"pass_id": pass_id, "status": "started"}
         
     except Exception as e:
@@ -88,56 +222,63 @@ async def create_new_pass(
 @router.get("/passes/{pass_id}")
 async def get_pass_result(pass_id: str) -> Dict[str, Any]:
     """Get pass result by ID."""
-    if pass_id not in pass_results:
+    state = await _load_state(pass_id)
+    if state is None:
         raise HTTPException(status_code=404, detail="Pass not found")
     
-    return pass_results[pass_id]
+    return state.to_response()
 
 
 @router.get("/passes/{pass_id}/status")
-async def get_pass_status(pass_id: str) -> Dict[str, str]:
-    """Get pass status by ID."""
-    if pass_id not in pass_results:
+async def get_pass_status(pass_id: str, request: Request) -> Response:
+    """
+    Get pass status by ID.
+    
+    Polled frequently, so the body is served pre-serialized and clients
+    sending a matching If-None-Match get 304 Not Modified.
+    """
+    status = await _load_status(pass_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Pass not found")
     
-    result = pass_results[pass_id]
-    return {
-        "pass_id": pass_id,
-        "status": result["status"],
-        "progress": _calculate_progress(result)
-    }
+    body, etag = status
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
-async def process_pass(pass_id: str, request: PassRequest):
-    """Background task to process the pass through all agents."""
+async def process_pass(pass_id: str, request: PassRequest) -> PassState:
+    """
+    Background task to process the pass through all agents.
+    
+    Returns:
+        Final state of the pass, also published to Redis when connected
+    """
     start_time = datetime.utcnow()
     total_cost = 0.0
+    # The pass may be picked up by a worker on another instance
+    state = await _load_state(pass_id)
+    if state is None:
+        state = PassState(
+            pass_id=pass_id,
+            created_at=start_time.isoformat()
+        )
+    if not job_queue.redis_client:
+        pass_results[pass_id] = state
     
     try:
-        # Initialize LLM client (in production, get from config/environment)
-        llm_client = LLMClient(
-            api_key="dummy_key",  # Replace with actual API key
-            base_url="https://openrouter.ai/api/v1"
-        )
+        # One shared client (configured from the environment) for every agent
+        llm_client = get_llm_client()
         
-        # Run supervisor agent first to plan the pass
-        logger.info(f"Pass {pass_id}: Running supervisor agent")
-        supervisor_result = await run_supervisor(
+        # The supervisor only contributes the variant skeleton, which is merged
+        # after the fact, so it runs alongside the requested agents
+        agent_tasks = [("supervisor", run_supervisor(
             scene_text=request.scene_text,
             scene_meta=request.scene_meta,
             metrics_config=request.targets,
             edge_intensity=request.edge_intensity,
             requested_agents=request.agents
-        )
-        
-        pass_results[pass_id]["agent_results"]["supervisor"] = supervisor_result
-        total_cost += supervisor_result.get("cost_usd", 0.0)
-        
-        # Initialize variants from supervisor
-        variants = supervisor_result.get("variants", {})
-        
-        # Run requested agents
-        agent_tasks = []
+        ))]
         
         if "lore_archivist" in request.agents:
             agent_tasks.append(("lore_archivist", _run_lore_archivist_task(request, llm_client)))
@@ -148,38 +289,40 @@ async def process_pass(pass_id: str, request: PassRequest):
         if "tone_metrics" in request.agents:
             agent_tasks.append(("tone_metrics", _run_tone_metrics_task(request, llm_client)))
         
-        # Run agents concurrently
-        if agent_tasks:
-            logger.info(f"Pass {pass_id}: Running {len(agent_tasks)} agents concurrently")
-            agent_names, agent_coroutines = zip(*agent_tasks)
-            agent_results = await asyncio.gather(*agent_coroutines, return_exceptions=True)
-            
-            # Process agent results
-            for agent_name, result in zip(agent_names, agent_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Agent {agent_name} failed: {str(result)}")
-                    pass_results[pass_id]["agent_results"][agent_name] = {"error": str(result)}
-                else:
-                    pass_results[pass_id]["agent_results"][agent_name] = result
-                    total_cost += result.get("cost_usd", 0.0)
+        # Run supervisor and agents concurrently
+        state.total_expected = len(agent_tasks)
+        await _publish_state(state)
+        logger.info(f"Pass {pass_id}: Running supervisor and {len(agent_tasks) - 1} agents concurrently")
+        agent_results = await asyncio.gather(*(
+            _run_tracked_agent(state, agent_name, coroutine, reraise=agent_name == "supervisor")
+            for agent_name, coroutine in agent_tasks
+        ), return_exceptions=True)
+        total_cost += sum(result.get("cost_usd", 0.0) for result in agent_results[1:])
+        
+        # Without the supervisor's variants there is nothing to compose the
+        # agent results into, so its failure fails the pass
+        if isinstance(agent_results[0], Exception):
+            raise agent_results[0]
+        total_cost += agent_results[0].get("cost_usd", 0.0)
+        
+        # Initialize variants from supervisor
+        variants = agent_results[0].get("variants", {})
         
         # Compose final variants with agent results
-        final_variants = _compose_variants(variants, pass_results[pass_id]["agent_results"], request)
+        final_variants = _compose_variants(variants, state.agent_results, request)
         
         # Generate overall assessment
-        overall_assessment = _generate_overall_assessment(pass_results[pass_id]["agent_results"], request)
+        overall_assessment = _generate_overall_assessment(state.agent_results, request)
         
         # Calculate processing time
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
         # Update final result
-        pass_results[pass_id].update({
-            "status": "completed",
-            "variants": final_variants,
-            "overall_assessment": overall_assessment,
-            "processing_time": processing_time,
-            "cost_usd": total_cost
-        })
+        state.status = "completed"
+        state.variants = final_variants
+        state.overall_assessment = overall_assessment
+        state.processing_time = processing_time
+        state.cost_usd = total_cost
         
         logger.info(f"Pass {pass_id}: Completed successfully in {processing_time:.2f}s")
         
@@ -187,32 +330,55 @@ async def process_pass(pass_id: str, request: PassRequest):
         logger.error(f"Pass {pass_id}: Failed with error: {str(e)}")
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
-        pass_results[pass_id].update({
-            "status": "failed",
-            "overall_assessment": f"Pass failed: {str(e)}",
-            "processing_time": processing_time,
-            "cost_usd": total_cost,
-            "error": str(e)
-        })
+        state.status = "failed"
+        state.overall_assessment = f"Pass failed: {str(e)}"
+        state.processing_time = processing_time
+        state.cost_usd = total_cost
+        state.error = str(e)
+    
+    await _publish_state(state)
+    return state
+
+
+async def process_pass_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job queue handler for queued passes (registered in background.py)."""
+    pass_id = payload["pass_id"]
+    state = await process_pass(pass_id, PassRequest(**payload["request"]))
+    return {"pass_id": pass_id, "status": state.status}
+
+
+async def _run_tracked_agent(state: PassState, agent_name: str, coroutine, reraise: bool = False) -> Dict[str, Any]:
+    """
+    Await one agent, recording its result and progress on the pass state as soon as it finishes.
+    
+    Failures are recorded as {"error": ...} and contribute no cost; with
+    reraise the exception is raised again once recorded.
+    """
+    try:
+        result = await coroutine
+        state.agent_results[agent_name] = result
+    except Exception as e:
+        logger.error(f"Agent {agent_name} failed: {str(e)}")
+        state.agent_results[agent_name] = {"error": str(e)}
+        if reraise:
+            raise
+        result = {}
+    finally:
+        state.completed_count += 1
+        await _publish_state(state)
+    return result
 
 
 async def _run_lore_archivist_task(request: PassRequest, llm_client: LLMClient) -> Dict[str, Any]:
     """Run lore archivist agent task."""
-    # Mock retrieve function for demo (in production, use actual vector search)
-    def mock_retrieve(query: str, k: int = 5, filters: Optional[Dict] = None):
-        return [
-            {
-                "source_path": "codex/characters/protagonist.md",
-                "start_line": 10,
-                "end_line": 20,
-                "text": f"Character information related to: {query}"
-            }
-        ]
+    # Canon comes from the int8 codex index; building it embeds every chunk,
+    # so keep that off the event loop
+    codex_index = await asyncio.to_thread(get_codex_index)
     
     return await run_lore_archivist(
         scene_text=request.scene_text,
         scene_meta=request.scene_meta,
-        retrieve_fn=mock_retrieve
+        retrieve_fn=codex_index.search
     )
 
 
@@ -257,10 +423,10 @@ def _compose_variants(
     # Add lore findings to bold and red_team variants
     lore_result = agent_results.get("lore_archivist", {})
     if lore_result.get("findings"):
-        blocking_findings = [f for f in lore_result.get("findings", []) if f.get("severity") == "block"]
+        blocking_count = sum(1 for f in lore_result.get("findings", []) if f.get("severity") == "block")
         
-        if blocking_findings and "bold" in variants:
-            variants["bold"]["lore_blocks"] = len(blocking_findings)
+        if blocking_count and "bold" in variants:
+            variants["bold"]["lore_blocks"] = blocking_count
             variants["bold"]["lore_diff"] = lore_result.get("diff", "")
         
         if "red_team" in variants:
@@ -290,7 +456,7 @@ def _generate_overall_assessment(agent_results: Dict[str, Dict[str, Any]], reque
     lore_result = agent_results.get("lore_archivist", {})
     if lore_result and not lore_result.get("error"):
         findings = lore_result.get("findings", [])
-        blocking = len([f for f in findings if f.get("severity") == "block"])
+        blocking = sum(1 for f in findings if f.get("severity") == "block")
         if blocking > 0:
             assessments.append(f"Found {blocking} blocking lore violations")
         else:
@@ -318,24 +484,16 @@ def _generate_overall_assessment(agent_results: Dict[str, Dict[str, Any]], reque
     return ". ".join(assessments) + "."
 
 
-def _calculate_progress(result: Dict[str, Any]) -> str:
+def _calculate_progress(state: PassState) -> str:
     """Calculate progress percentage for a running pass."""
-    if result["status"] == "completed":
+    if state.status == "completed":
         return "100%"
-    elif result["status"] == "failed":
+    elif state.status == "failed":
         return "failed"
     
-    # Count completed agents
-    agent_results = result.get("agent_results", {})
-    completed_agents = len([r for r in agent_results.values() if r])
-    
-    # Estimate total agents (supervisor + requested)
-    total_agents = 1  # supervisor always runs
-    if isinstance(agent_results, dict):
-        total_agents += len([k for k in agent_results.keys() if k != "supervisor"])
-    
-    if total_agents == 0:
+    # Agents are counted once their tasks are built; nothing to report before that
+    if state.total_expected == 0:
         return "0%"
     
-    progress = (completed_agents / total_agents) * 100
+    progress = (state.completed_count / state.total_expected) * 100
     return f"{progress:.0f}%"
\ No newline at end of file
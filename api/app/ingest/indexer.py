@@ -10,7 +10,9 @@ import hashlib
 import json
 
 from ..models import Scene, SceneEmbedding
+from ..statements import get_scene
 from ..db import get_write_session
+from ..services.search_service import search_service
 
 
 def discover_files(paths: List[str]) -> List[Path]:
@@ -184,7 +186,7 @@ def index_files(paths: List[str], reindex: bool = False) -> Dict[str, int]:
                 scene_id = meta['id']
                 
                 # Check if scene exists
-                existing_scene = db.query(Scene).filter(Scene.id == scene_id).first()
+                existing_scene = get_scene(db, scene_id)
                 
                 if existing_scene and not reindex:
                     print(f"Scene {scene_id} already indexed, skipping")
@@ -217,4 +219,8 @@ def index_files(paths: List[str], reindex: bool = False) -> Dict[str, int]:
         # Commit all changes
         db.commit()
     
+    # Semantic search caches a stacked embedding matrix; rebuild it next query.
+    # Only after the commit, or a search in between would cache the old rows.
+    search_service.invalidate_embeddings()
+    
     return results
\ No newline at end of file
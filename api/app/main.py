@@ -2,13 +2,18 @@
 from fastapi import FastAPI, HTTPException
 from contextlib import asynccontextmanager
 from typing import Dict, Any
+import asyncio
+import contextlib
+import importlib
 import logging
+import time
 
 from .config import settings
 from .db import init_database
 from .utils.logging_config import setup_logging
 from .middleware import setup_middleware
 from .background import job_queue
+from .services.llm_client import close_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +28,13 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_database()
     
-    # Connect to Redis for background jobs
+    # Connect to Redis for background jobs, and drain the queue in-process
     await job_queue.connect()
+    from .auth import reset_auth_registry
+    await reset_auth_registry()
+    worker_task = None
+    if job_queue.redis_client:
+        worker_task = asyncio.create_task(job_queue.start_worker())
     
     # Log startup configuration
     logger.info("Configuration:")
@@ -37,7 +47,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}...")
+    if worker_task:
+        await job_queue.stop_worker()
+        worker_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker_task
     await job_queue.disconnect()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -64,92 +80,128 @@ async def root() -> Dict[str, Any]:
     }
 
 
-@app.get("/health")
-async def health() -> Dict[str, Any]:
-    """Health check endpoint."""
+# Probes hit /health far more often than its answer changes; serve a result
+# for HEALTH_TTL seconds and let a single request refresh it
+HEALTH_TTL = 2.0
+_health_cache: Dict[str, Any] = {"ts": 0.0, "result": None}
+_health_lock = asyncio.Lock()
+
+
+def _check_db_sync() -> None:
+    """Run SELECT 1 on a read session."""
+    from .db import get_read_session
+    from sqlalchemy import text
+    
+    db_session = next(get_read_session())
     try:
-        # Test database connection
-        from .db import get_read_session
-        from sqlalchemy import text
-        
-        db_session = next(get_read_session())
-        try:
-            db_session.execute(text("SELECT 1"))
-        finally:
-            db_session.close()
-        
-        db_status = "ok"
+        db_session.execute(text("SELECT 1"))
+    finally:
+        db_session.close()
+
+
+async def _probe_db() -> str:
+    """Test the database connection without blocking the event loop."""
+    try:
+        await asyncio.to_thread(_check_db_sync)
+        return "ok"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
-        db_status = "error"
-    
-    # Test Redis connection
+        return "error"
+
+
+async def _probe_redis() -> str:
+    """Test the Redis connection on the dedicated probe pool."""
     try:
-        if job_queue.redis_client:
-            await job_queue.redis_client.ping()
-            redis_status = "ok"
-        else:
-            redis_status = "disconnected"
+        if job_queue.probe_client:
+            await job_queue.probe_client.ping()
+            return "ok"
+        return "disconnected"
     except Exception as e:
         logger.error(f"Redis health check failed: {e}")
-        redis_status = "error"
-    
-    status = "ok" if db_status == "ok" else "degraded"
+        return "error"
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    """Health check endpoint."""
+    if time.monotonic() - _health_cache["ts"] < HEALTH_TTL:
+        return _health_cache["result"]
     
-    return {
-        "status": status,
-        "database": db_status,
-        "redis": redis_status,
-        "background_jobs": "enabled" if redis_status == "ok" else "disabled"
-    }
+    async with _health_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() - _health_cache["ts"] < HEALTH_TTL:
+            return _health_cache["result"]
+        
+        # The probes are independent, so wait on both at once
+        db_status, redis_status = await asyncio.gather(_probe_db(), _probe_redis())
+        
+        status = "ok" if db_status == "ok" else "degraded"
+        
+        _health_cache["ts"] = time.monotonic()
+        _health_cache["result"] = {
+            "status": status,
+            "database": db_status,
+            "redis": redis_status,
+            "background_jobs": "enabled" if redis_status == "ok" else "disabled"
+        }
+        return _health_cache["result"]
+
+
+# Scrapers poll /metrics; recount at most every METRICS_TTL seconds
+METRICS_TTL = 5.0
+_metrics_cache: Dict[str, Any] = {"ts": 0.0, "result": None}
 
 
 @app.get("/metrics")
 async def metrics() -> Dict[str, Any]:
     """Basic metrics endpoint."""
+    if time.monotonic() - _metrics_cache["ts"] < METRICS_TTL:
+        return _metrics_cache["result"]
+    
     try:
-        from .auth import _api_keys, _user_llm_keys
+        from .auth import count_auth_entries
         
-        return {
-            "active_sessions": len(_api_keys),
-            "users_with_llm_keys": len(_user_llm_keys),
+        active_sessions, users_with_llm_keys = await count_auth_entries()
+        _metrics_cache["ts"] = time.monotonic()
+        _metrics_cache["result"] = {
+            "active_sessions": active_sessions,
+            "users_with_llm_keys": users_with_llm_keys,
             "system_health": "ok"
         }
+        return _metrics_cache["result"]
     except Exception as e:
         logger.error(f"Metrics collection failed: {e}")
         raise HTTPException(status_code=500, detail="Metrics unavailable")
 
 
-# Import and include routers
-from .routers.auth import router as auth_router
-from .routers.jobs import router as jobs_router
-from .routers.ingest import router as ingest_router
-from .routers.scenes import router as scenes_router
-from .routers.codex import router as codex_router
-from .routers.models import router as models_router
-from .routers.patches import router as patches_router
-from .routers.diff import router as diff_router
-from .routers.reports import router as reports_router
-from .routers.search import router as search_router
-from .routers.passes import router as passes_router
-from .routers.ai import router as ai_router
-
-# Include routers
-app.include_router(auth_router, prefix="/api")  # Auth first (no auth required)
-app.include_router(jobs_router, prefix="/api")  # Background jobs
-
-# Protected endpoints
-from .routers.protected import router as protected_router
-app.include_router(protected_router, prefix="/api")
-
-# Core functionality endpoints (require auth)
-app.include_router(ingest_router, prefix="/api")
-app.include_router(scenes_router, prefix="/api")
-app.include_router(codex_router, prefix="/api")
-app.include_router(models_router, prefix="/api")
-app.include_router(patches_router, prefix="/api")
-app.include_router(diff_router, prefix="/api")
-app.include_router(reports_router, prefix="/api")
-app.include_router(search_router, prefix="/api")
-app.include_router(passes_router, prefix="/api")
-app.include_router(ai_router, prefix="/api")
\ No newline at end of file
+# Routers in include order; imported by name so that routers disabled via
+# ENABLED_ROUTERS (and everything they pull in) are never loaded
+ROUTER_MODULES = (
+    "auth",       # Auth first (no auth required)
+    "jobs",       # Background jobs
+    "protected",  # Protected endpoints
+    # Core functionality endpoints (require auth)
+    "ingest",
+    "scenes",
+    "codex",
+    "models",
+    "patches",
+    "diff",
+    "reports",
+    "search",
+    "passes",
+    "ai",
+)
+
+
+def include_routers(app: FastAPI) -> None:
+    """Import and include the enabled routers."""
+    enabled = settings.enabled_routers
+    for name in ROUTER_MODULES:
+        if enabled is not None and name not in enabled:
+            continue
+        module = importlib.import_module(f".routers.{name}", __package__)
+        app.include_router(module.router, prefix="/api")
+
+
+include_routers(app)
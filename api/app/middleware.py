@@ -1,99 +1,197 @@
 """Security and middleware configuration."""
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .config import settings
+from contextvars import ContextVar
+from typing import List, MutableSequence, Optional, Tuple
+import random
+import secrets
 import time
 import logging
-import uuid
 
 logger = logging.getLogger(__name__)
 
+# Probe and polling endpoints: only a sample of these is logged, at DEBUG
+_QUIET_PATHS = frozenset({"/health", "/metrics", "/"})
+_QUIET_SAMPLE_RATE = 0.1
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Local dev servers and any Replit deployment or workspace (which may have
+# several labels, e.g. <id>-00-<slug>.<cluster>.replit.dev); one regex match
+# per request instead of a scan of an origin list
+_CORS_ORIGIN_REGEX = r"^(http://localhost:(3000|5000)|https://([a-z0-9-]+\.)+replit\.(app|dev))$"
+_CORS_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+_CORS_HEADERS = [
+    "Authorization",
+    "Content-Type",
+    "X-API-Key",
+    "X-Request-ID",
+    "X-Correlation-ID",
+    "If-None-Match",
+]
+
+# Interactive docs assets, never traced
+_UNTRACED_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"})
+
+# Client-supplied IDs that are reused instead of minting a new one
+_CORRELATION_HEADERS = (b"x-request-id", b"x-correlation-id")
+
+# Correlation ID of the request being handled, visible to every task it spawns
+correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="-")
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Stamp log records with the current request's correlation ID."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id_var.get()
+        return True
+
+
+# Content Security Policy
+_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https:; "
+    "connect-src 'self' https://openrouter.ai;"
+)
+
+# Raw ASGI header pairs, encoded once at import
+_SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    (b"content-security-policy", _CSP.encode("latin-1")),
+]
+
+
+def _response_headers(message: Message) -> MutableSequence[Tuple[bytes, bytes]]:
+    """Return the raw header list of a response start message, editable in place."""
+    headers = message.get("headers")
+    if not isinstance(headers, list):
+        # Starlette sends a list; copy anything else once
+        headers = message["headers"] = list(headers or ())
+    return headers
+
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses."""
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Content Security Policy
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "connect-src 'self' https://openrouter.ai;"
-        )
-        response.headers["Content-Security-Policy"] = csp
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                _response_headers(message).extend(_SECURITY_HEADERS)
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
+
 
+def _incoming_correlation_id(scope: Scope) -> Optional[str]:
+    """Return a correlation ID sent by the client, if any."""
+    for name, value in scope["headers"]:
+        if name in _CORRELATION_HEADERS and value:
+            return value.decode("latin-1")
+    return None
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+class RequestLoggingMiddleware:
     """Log all requests with timing and correlation IDs."""
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate correlation ID
-        correlation_id = str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Start timing
-        start_time = time.time()
+        path = scope["path"]
+        if path in _UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
         
-        # Log request
-        logger.info(
-            f"Request started",
-            extra={
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "url": str(request.url),
-                "client_ip": request.client.host if request.client else "unknown"
-            }
-        )
+        quiet = path in _QUIET_PATHS
+        if quiet and random.random() >= _QUIET_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+        log_level = logging.DEBUG if quiet else logging.INFO
         
-        # Process request
-        try:
-            response = await call_next(request)
-            
-            # Calculate timing
-            duration = time.time() - start_time
-            
-            # Add correlation ID to response
-            response.headers["X-Correlation-ID"] = correlation_id
-            
-            # Log response
-            logger.info(
-                f"Request completed",
+        # Reuse the caller's correlation ID or generate a 64-bit one; request.state reads scope["state"]
+        correlation_id = _incoming_correlation_id(scope) or secrets.token_hex(8)
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        token = correlation_id_var.set(correlation_id)
+        correlation_header = (b"x-correlation-id", correlation_id.encode("latin-1"))
+        
+        # Start timing
+        start_ns = time.perf_counter_ns()
+        
+        # Log request; skip building the record entirely when the level is off
+        if logger.isEnabledFor(log_level):
+            request = Request(scope)
+            logger.log(
+                log_level,
+                "Request started",
                 extra={
-                    "correlation_id": correlation_id,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration * 1000, 2)
+                    "method": request.method,
+                    "url": str(request.url),
+                    "client_ip": request.client.host if request.client else "unknown"
                 }
             )
-            
-            return response
+        
+        status_code = 500
+        
+        async def send_with_correlation_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add correlation ID to response
+                _response_headers(message).append(correlation_header)
+            await send(message)
+        
+        # Process request
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
             
         except Exception as e:
             # Calculate timing
-            duration = time.time() - start_time
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             # Log error
             logger.error(
-                f"Request failed",
+                "Request failed",
                 extra={
-                    "correlation_id": correlation_id,
                     "error": str(e),
-                    "duration_ms": round(duration * 1000, 2)
+                    "duration_ms": round(duration_ms, 2)
                 }
             )
             raise
+        
+        else:
+            # Log response
+            if logger.isEnabledFor(log_level):
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                logger.log(
+                    log_level,
+                    "Request completed",
+                    extra={
+                        "status_code": status_code,
+                        "duration_ms": round(duration_ms, 2)
+                    }
+                )
+        
+        finally:
+            correlation_id_var.reset(token)
 
 
 def setup_middleware(app):
@@ -105,24 +203,20 @@ def setup_middleware(app):
     # Security headers
     app.add_middleware(SecurityHeadersMiddleware)
     
-    # Trusted hosts (production security)
-    app.add_middleware(
-        TrustedHostMiddleware,
-        allowed_hosts=["*"]  # Configure appropriately for production
-    )
+    # Trusted hosts (production security); a wildcard would check nothing
+    if settings.allowed_hosts != ["*"]:
+        app.add_middleware(
+            TrustedHostMiddleware,
+            allowed_hosts=settings.allowed_hosts
+        )
     
     # CORS (last middleware, first to process responses)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[
-            "http://localhost:3000",
-            "http://localhost:5000",
-            "https://*.replit.app",
-            "https://*.replit.dev"
-        ],
+        allow_origin_regex=_CORS_ORIGIN_REGEX,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=_CORS_METHODS,
+        allow_headers=_CORS_HEADERS,
         expose_headers=["X-Correlation-ID"]
     )
     
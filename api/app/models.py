@@ -1,14 +1,150 @@
 """SQLAlchemy ORM models."""
-from sqlalchemy import Column, String, Integer, Text, JSON, TIMESTAMP, ForeignKey, Float, Index
+from sqlalchemy import Column, String, Integer, Text, JSON, TIMESTAMP, ForeignKey, Float, Index, LargeBinary
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
+import struct
 import uuid
 
+import msgspec
+import numpy as np
+
 from .db import Base
 
-# Simplified approach without pgvector for now
-VECTOR_AVAILABLE = False
+try:
+    from pgvector.sqlalchemy import Vector
+    VECTOR_AVAILABLE = True
+except ImportError:
+    Vector = None
+    VECTOR_AVAILABLE = False
+
+# Dimension of the scene chunk embeddings (see rag/embeddings.py)
+EMBEDDING_DIM = 384
+
+# Queryable JSON documents: binary jsonb on PostgreSQL, plain JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+# Embedding frames are a 4-byte big-endian length followed by little-endian
+# float32s. When the top bit of the length is set the frame is int8 instead:
+# a float32 scale followed by one signed byte per dimension.
+_EMBEDDING_HEADER = struct.Struct(">I")
+_EMBEDDING_DTYPE = np.dtype("<f4")
+_INT8_FLAG = 0x80000000
+_INT8_SCALE = struct.Struct("<f")
+
+
+def quantize_embedding(vector: np.ndarray) -> tuple:
+    """
+    Quantize an embedding to int8 with a single symmetric scale.
+    
+    Returns:
+        Tuple of (scale, int8 values); the vector is approximately values * scale
+    """
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    values = np.round(vector / scale).astype(np.int8)
+    return scale, values
+
+
+class MsgPackType(TypeDecorator):
+    """Store JSON-like payloads as MessagePack bytes instead of JSON text."""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return _msgpack_encoder.encode(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _msgpack_decoder.decode(value)
+
+
+class gen_random_uuid(FunctionElement):
+    """Random version-4 UUID string generated by the database on INSERT."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid, "postgresql")
+def _gen_random_uuid_postgresql(element, compiler, **kw):
+    return "gen_random_uuid()::text"
+
+
+@compiles(gen_random_uuid)
+def _gen_random_uuid_default(element, compiler, **kw):
+    # SQLite has no UUID function, so assemble one from randomblob()
+    return (
+        "(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+        "substr(lower(hex(randomblob(2))), 2) || '-' || "
+        "substr('89ab', abs(random()) % 4 + 1, 1) || substr(lower(hex(randomblob(2))), 2) || '-' || "
+        "lower(hex(randomblob(6))))"
+    )
+
+
+def _use_pgvector(dialect) -> bool:
+    """Check whether embeddings use the native pgvector column on this dialect."""
+    return VECTOR_AVAILABLE and dialect.name == "postgresql"
+
+
+class EmbeddingType(TypeDecorator):
+    """
+    Store embedding vectors natively where possible.
+    
+    PostgreSQL with pgvector gets a vector(EMBEDDING_DIM) column; other
+    databases store a length-prefixed float32 frame, or an int8 frame (4x
+    smaller) when quantize is set. Both frame kinds decode to float32.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    class comparator_factory(TypeDecorator.Comparator):
+        def cosine_distance(self, other):
+            """pgvector cosine distance (<=>) to another vector."""
+            return self.op("<=>", return_type=Float)(other)
+    
+    def __init__(self, quantize: bool = False):
+        super().__init__()
+        self.quantize = quantize
+    
+    def load_dialect_impl(self, dialect):
+        if _use_pgvector(dialect):
+            return dialect.type_descriptor(Vector(EMBEDDING_DIM))
+        return dialect.type_descriptor(LargeBinary())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if _use_pgvector(dialect):
+            return np.asarray(value, dtype=np.float32)
+        vector = np.asarray(value, dtype=_EMBEDDING_DTYPE).ravel()
+        if self.quantize:
+            scale, values = quantize_embedding(vector)
+            return _EMBEDDING_HEADER.pack(vector.size | _INT8_FLAG) + _INT8_SCALE.pack(scale) + values.tobytes()
+        return _EMBEDDING_HEADER.pack(vector.size) + vector.tobytes()
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if _use_pgvector(dialect):
+            return value
+        (size,) = _EMBEDDING_HEADER.unpack_from(value)
+        if size & _INT8_FLAG:
+            (scale,) = _INT8_SCALE.unpack_from(value, _EMBEDDING_HEADER.size)
+            values = np.frombuffer(
+                value, dtype=np.int8, count=size & ~_INT8_FLAG,
+                offset=_EMBEDDING_HEADER.size + _INT8_SCALE.size
+            )
+            return values.astype(np.float32) * np.float32(scale)
+        return np.frombuffer(value, dtype=_EMBEDDING_DTYPE, count=size, offset=_EMBEDDING_HEADER.size)
 
 
 class Scene(Base):
@@ -21,8 +157,8 @@ class Scene(Base):
     pov = Column(Text, index=True)
     location = Column(Text, index=True)
     text_path = Column(Text)  # Path to markdown file
-    beats_json = Column(JSON)
-    links_json = Column(JSON)
+    beats_json = Column(MsgPackType)
+    links_json = Column(MsgPackType)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now(), index=True)
     
@@ -45,11 +181,11 @@ class Character(Base):
     
     id = Column(String, primary_key=True)  # e.g., "char:MC"
     name = Column(Text, nullable=False)
-    voice_tags_json = Column(JSON)
-    preferred_words_json = Column(JSON)
-    banned_words_json = Column(JSON)
-    arc_flags_json = Column(JSON)
-    canon_quotes_json = Column(JSON)
+    voice_tags_json = Column(JSONDocument)
+    preferred_words_json = Column(JSONDocument)
+    banned_words_json = Column(JSONDocument)
+    arc_flags_json = Column(JSONDocument)
+    canon_quotes_json = Column(JSONDocument)
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
 
@@ -57,12 +193,12 @@ class Job(Base):
     """Job model for tracking agent processing."""
     __tablename__ = "jobs"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, server_default=gen_random_uuid())
     scene_id = Column(String, ForeignKey("scenes.id"), nullable=False, index=True)
     status = Column(String, nullable=False, default="queued", index=True)  # queued|running|done|error
     job_type = Column(String, nullable=False, default="agent_processing", index=True)
-    agents_json = Column(JSON)
-    result_json = Column(JSON)
+    agents_json = Column(MsgPackType)
+    result_json = Column(MsgPackType)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now(), index=True)
     
@@ -75,6 +211,7 @@ class Job(Base):
         Index('idx_job_scene_status', 'scene_id', 'status'),
         Index('idx_job_status_type', 'status', 'job_type'),
         Index('idx_job_created_status', 'created_at', 'status'),
+        Index('ix_jobs_status_created', 'status', 'created_at'),
     )
 
 
@@ -82,17 +219,17 @@ class Artifact(Base):
     """Artifact model for storing generated patches/diffs."""
     __tablename__ = "artifacts"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, server_default=gen_random_uuid())
     job_id = Column(String, ForeignKey("jobs.id"), nullable=False, index=True)
     scene_id = Column(String, ForeignKey("scenes.id"), nullable=False, index=True)
     artifact_type = Column(String, nullable=False, index=True)  # agent_result|patch|diff
     variant = Column(String, nullable=False, index=True)  # safe|bold|red_team
     content = Column(Text)  # Direct content storage
-    meta_data = Column(JSON)  # Additional metadata (renamed from metadata)
+    meta_data = Column(JSONDocument)  # Additional metadata (renamed from metadata)
     diff_key = Column(Text)  # S3 key for diff file (optional)
-    metrics_before = Column(JSON)
-    metrics_after = Column(JSON)
-    receipts_json = Column(JSON)
+    metrics_before = Column(MsgPackType)
+    metrics_after = Column(MsgPackType)
+    receipts_json = Column(MsgPackType)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
     
@@ -105,6 +242,12 @@ class Artifact(Base):
         Index('idx_artifact_job_type', 'job_id', 'artifact_type'),
         Index('idx_artifact_scene_variant', 'scene_id', 'variant'),
         Index('idx_artifact_type_created', 'artifact_type', 'created_at'),
+        # Containment (@>) lookups on metadata, e.g. by agent or model; PostgreSQL only
+        Index(
+            'idx_artifact_meta_gin', 'meta_data',
+            postgresql_using='gin',
+            postgresql_ops={'meta_data': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
     )
 
 
@@ -113,19 +256,27 @@ class SceneEmbedding(Base):
     __tablename__ = "scene_embeddings"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    scene_id = Column(String, ForeignKey("scenes.id"), nullable=False, index=True)
+    scene_id = Column(String, ForeignKey("scenes.id"), nullable=False)
     chunk_no = Column(Integer, nullable=False)
     content = Column(Text)
     
-    # Store embeddings as JSON array
-    embedding = Column(JSON)  # JSON storage for embeddings
+    # pgvector on PostgreSQL, int8-quantized bytes elsewhere
+    embedding = Column(EmbeddingType(quantize=True))
     
-    meta = Column(JSON)
+    meta = Column(JSONDocument)
     
     # Relationships
     scene = relationship("Scene", back_populates="embeddings")
     
     __table_args__ = (
-        # Composite index for efficient chunk retrieval
+        # One row per chunk; the unique index also serves chunk and scene_id lookups
+        Index('ix_scene_embeddings_scene_chunk', 'scene_id', 'chunk_no', unique=True),
+        # Approximate nearest-neighbour index for cosine search; pgvector only
+        Index(
+            'ix_scene_embeddings_hnsw', 'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'}
+        ).ddl_if(callable_=lambda ddl, target, bind, dialect, **kw: _use_pgvector(dialect)),
         {"postgresql_using": "btree", "mysql_using": "btree"},
     )
\ No newline at end of file
@@ -3,7 +3,7 @@
 from .embeddings import embed_texts, get_embedding_model
 from .chunker import chunk_markdown, chunk_text
 from .chroma_client import ChromaClient, get_chroma_client
-from .retrieve import retrieve_canon, retrieve_similar
+from .retrieve import retrieve_canon, retrieve_canon_batch, retrieve_similar
 
 __all__ = [
     "embed_texts",
@@ -13,5 +13,6 @@ __all__ = [
     "ChromaClient",
     "get_chroma_client",
     "retrieve_canon",
+    "retrieve_canon_batch",
     "retrieve_similar",
 ]
\ No newline at end of file
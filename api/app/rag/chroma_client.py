@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Optional, Union
 import numpy as np
 import logging
 
+from .query_cache import canon_query_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +60,8 @@ class ChromaClient:
         )
         
         logger.info(f"Upserted {len(ids)} items to collection '{collection}'")
+        # Cached retrievals may now be missing the new chunks
+        canon_query_cache.clear()
     
     def query(
         self,
@@ -119,10 +123,61 @@ class ChromaClient:
             "documents": documents_list[0] if len(documents_list) > 0 else []
         }
     
+    def query_batch(
+        self,
+        collection: str,
+        query_texts: List[str],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query a collection with several texts in one call.
+        
+        Args:
+            collection: Name of the collection
+            query_texts: Texts to search for (will be embedded)
+            top_k: Number of results to return per query
+            filters: Optional metadata filters
+            
+        Returns:
+            One result dict per query, in the same format as query()
+        """
+        empty = {"ids": [], "distances": [], "metadatas": [], "documents": []}
+        if not query_texts:
+            return []
+        
+        try:
+            coll = self.client.get_collection(name=collection)
+        except Exception as e:
+            logger.warning(f"Collection '{collection}' not found: {e}")
+            return [dict(empty) for _ in query_texts]
+        
+        results = coll.query(
+            query_texts=query_texts,
+            n_results=top_k,
+            where=filters
+        )
+        
+        ids_list = results.get("ids") or []
+        distances_list = results.get("distances") or []
+        metadatas_list = results.get("metadatas") or []
+        documents_list = results.get("documents") or []
+        
+        return [
+            {
+                "ids": ids_list[i] if i < len(ids_list) else [],
+                "distances": distances_list[i] if i < len(distances_list) else [],
+                "metadatas": metadatas_list[i] if i < len(metadatas_list) else [],
+                "documents": documents_list[i] if i < len(documents_list) else []
+            }
+            for i in range(len(query_texts))
+        ]
+    
     def delete_collection(self, collection: str) -> bool:
         """Delete a collection."""
         try:
             self.client.delete_collection(name=collection)
+            canon_query_cache.clear()
             logger.info(f"Deleted collection '{collection}'")
             return True
         except Exception as e:
@@ -1,15 +1,31 @@
 """Embeddings module with improved text embeddings."""
 import numpy as np
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional
 import hashlib
 import logging
 import re
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 
 logger = logging.getLogger(__name__)
 
 # Global model instance (lazy loaded)
 _embedding_model = None
+# Whether _embedding_model is a sentence-transformers model
+_is_st = False
+# Deterministic embedder used when the model fails (lazy loaded)
+_fallback_embedder = None
+
+# Anything that is neither a word character nor whitespace
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Document embeddings by content hash (blake2b-128), least recently used first
+DOC_CACHE_SIZE = 10000
+_DOC_CACHE: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_doc_cache_lock = threading.Lock()
+
+# Texts per forward pass when sentence-transformers encodes a list
+ST_BATCH_SIZE = 64
 
 # Try to import sentence-transformers, fall back to improved deterministic model
 try:
@@ -21,6 +37,55 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logger.info("sentence-transformers not available, using improved deterministic model")
 
+# Numba fuses the deterministic embedder's gather, mean and normalize into one pass
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None  # type: ignore
+    NUMBA_AVAILABLE = False
+
+
+def _mean_normalize(matrix: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Average the given rows of matrix and scale the mean to unit length.
+    
+    Written as plain loops for Numba, which compiles it to a single pass
+    with no gathered copy of the rows.
+    
+    Args:
+        matrix: float32 array of shape (num_words, embedding_dim)
+        rows: Row indices to average (at least one)
+        
+    Returns:
+        float32 array of shape (embedding_dim,)
+    """
+    dim = matrix.shape[1]
+    out = np.zeros(dim, dtype=np.float32)
+    for row in rows:
+        for d in range(dim):
+            out[d] += matrix[row, d]
+    
+    inv_count = np.float32(1.0 / rows.shape[0])
+    norm_sq = 0.0
+    for d in range(dim):
+        out[d] *= inv_count
+        norm_sq += out[d] * out[d]
+    
+    if norm_sq > 0:
+        inv_norm = np.float32(1.0 / np.sqrt(norm_sq))
+        for d in range(dim):
+            out[d] *= inv_norm
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # nogil lets encode's thread pool run the kernel in parallel
+    _mean_normalize = njit(cache=True, fastmath=True, nogil=True)(_mean_normalize)
+
+# Below this many tokens the NumPy path is cheaper than a Numba call
+_NUMBA_MIN_TOKENS = 5
+
 
 class ImprovedDeterministicEmbedder:
     """Improved deterministic embedding model with better semantic representation."""
@@ -29,28 +94,142 @@ class ImprovedDeterministicEmbedder:
         self.embedding_dim = embedding_dim
         self.vocabulary = {}
         self.vocab_size = 10000  # Common words vocabulary
+        # Digest byte feeding each dimension (a SHA-256 digest is 32 bytes)
+        self._byte_index = np.arange(embedding_dim) % hashlib.sha256().digest_size
+        # Word embeddings are pure functions of the word; common words repeat
+        # across every document, so keep up to _cache_cap of them as rows of
+        # one matrix that documents can gather and average in a single pass
+        self._cache_cap = 50000
+        self._word_to_row: Dict[str, int] = {}
+        self._cache_matrix = np.empty((1024, embedding_dim), dtype=np.float32)
+        self._cache_len = 0
+        # The model is shared by request threads; lookups are lock-free and
+        # hashing happens outside the lock, which only guards row inserts
+        self._cache_lock = threading.Lock()
         
     def _preprocess_text(self, text: str) -> List[str]:
         """Preprocess text into tokens."""
         # Lowercase and remove special characters
-        text = re.sub(r'[^\w\s]', '', text.lower())
+        text = _PUNCT_RE.sub('', text.lower())
         tokens = text.split()
         return tokens
     
+    def _hash_word(self, word: str) -> np.ndarray:
+        """Compute the embedding of a word from its SHA-256 digest."""
+        # Digest bytes repeated over the dimensions, mapped from [0, 255] onto [-1, 1]
+        word_hash = np.frombuffer(hashlib.sha256(word.encode()).digest(), dtype=np.uint8)
+        embedding = word_hash[self._byte_index].astype(np.float32)
+        embedding *= np.float32(2.0 / 255.0)
+        embedding -= np.float32(1.0)
+        
+        # Normalize in place
+        norm_sq = np.vdot(embedding, embedding)
+        if norm_sq > 0:
+            embedding *= np.float32(1.0 / np.sqrt(norm_sq))
+        return embedding
+    
+    def _insert_row(self, word: str, embedding: np.ndarray) -> int:
+        """
+        Store a hashed word embedding in the cache matrix; call with _cache_lock held.
+        
+        Returns:
+            Row index, or -1 when the word is not cached and the cache is full
+        """
+        row = self._word_to_row.get(word)
+        if row is not None:
+            # Another thread published it first
+            return row
+        if self._cache_len >= self._cache_cap:
+            return -1
+        
+        if self._cache_len == len(self._cache_matrix):
+            # Grow geometrically up to the cap rather than reserving it all upfront
+            grown = np.empty((min(2 * self._cache_len, self._cache_cap), self.embedding_dim), dtype=np.float32)
+            grown[:self._cache_len] = self._cache_matrix[:self._cache_len]
+            self._cache_matrix = grown
+        
+        # The row is written before the word maps to it, so lock-free readers
+        # never see a row index without its data
+        row = self._cache_len
+        self._cache_matrix[row] = embedding
+        self._word_to_row[word] = row
+        self._cache_len += 1
+        return row
+    
+    def _row_for(self, word: str) -> int:
+        """
+        Get the cache matrix row holding a word's embedding, adding it if needed.
+        
+        Returns:
+            Row index, or -1 when the word is not cached and the cache is full
+        """
+        row = self._word_to_row.get(word)
+        if row is not None:
+            return row
+        embedding = self._hash_word(word)
+        with self._cache_lock:
+            return self._insert_row(word, embedding)
+    
     def _get_word_embedding(self, word: str) -> np.ndarray:
-        """Generate consistent embedding for a word."""
-        # Use hash to generate consistent embedding
-        word_hash = hashlib.sha256(word.encode()).digest()
-        embedding = np.array([
-            (word_hash[i % len(word_hash)] / 255.0) * 2 - 1 
-            for i in range(self.embedding_dim)
-        ], dtype=np.float32)
-        
-        # Normalize
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-            
+        """
+        Generate consistent embedding for a word.
+        
+        Returned arrays may be views into the word cache and are read-only.
+        """
+        row = self._row_for(word)
+        if row < 0:
+            embedding = self._hash_word(word)
+        else:
+            embedding = self._cache_matrix[row]
+        embedding.setflags(write=False)
+        return embedding
+    
+    def _encode_one(self, text: str) -> Optional[np.ndarray]:
+        """
+        Encode a single text.
+        
+        Returns:
+            Unit-length embedding, or None if the text has no tokens
+        """
+        tokens = self._preprocess_text(text)
+        if not tokens:
+            return None
+        
+        word_to_row = self._word_to_row
+        rows = np.fromiter((word_to_row.get(token, -1) for token in tokens), dtype=np.intp, count=len(tokens))
+        
+        hashed = {}
+        if rows.min() < 0:
+            # Hash new words without the lock, then publish them all at once
+            misses = np.flatnonzero(rows < 0)
+            hashed = {tokens[i]: None for i in misses}
+            for word in hashed:
+                hashed[word] = self._hash_word(word)
+            with self._cache_lock:
+                published = {word: self._insert_row(word, embedding) for word, embedding in hashed.items()}
+            for i in misses:
+                rows[i] = published[tokens[i]]
+        
+        # Read after the rows are resolved: growth swaps in a new matrix but
+        # copies every existing row, so this one holds all of them
+        matrix = self._cache_matrix
+        
+        # Average word embeddings: one gather over the cache matrix
+        if rows.min() >= 0:
+            if NUMBA_AVAILABLE and len(rows) >= _NUMBA_MIN_TOKENS:
+                return _mean_normalize(matrix, rows)
+            embedding = matrix[rows].mean(axis=0, dtype=np.float32)
+        else:
+            # Cache is full; words left out of it use their fresh hashes
+            embedding = np.stack([
+                matrix[row] if row >= 0 else hashed[token]
+                for token, row in zip(tokens, rows)
+            ]).mean(axis=0, dtype=np.float32)
+        
+        # Normalize final embedding
+        norm_sq = np.vdot(embedding, embedding)
+        if norm_sq > 0:
+            embedding *= np.float32(1.0 / np.sqrt(norm_sq))
         return embedding
     
     def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
@@ -60,42 +239,30 @@ class ImprovedDeterministicEmbedder:
             single_input = True
         else:
             single_input = False
-            
-        embeddings = []
-        
-        for text in texts:
-            tokens = self._preprocess_text(text)
-            
-            if not tokens:
-                # Empty text
-                embedding = np.zeros(self.embedding_dim, dtype=np.float32)
-            else:
-                # Average word embeddings
-                word_embeddings = [self._get_word_embedding(token) for token in tokens]
-                embedding = np.mean(word_embeddings, axis=0).astype(np.float32)
-                
-                # Normalize final embedding
-                norm = np.linalg.norm(embedding)
-                if norm > 0:
-                    embedding = embedding / norm
-            
-            embeddings.append(embedding)
-        
-        embeddings_array = np.array(embeddings)
+        
+        # Empty texts keep their zero rows
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        
+        for i, text in enumerate(texts):
+            embedding = self._encode_one(text)
+            if embedding is not None:
+                embeddings[i] = embedding
         
         if single_input:
-            return embeddings_array[0]
-        return embeddings_array
+            return embeddings[0]
+        return embeddings
 
 
 def get_embedding_model():
     """Get or create the embedding model instance."""
-    global _embedding_model
+    global _embedding_model, _is_st
     if _embedding_model is None:
         if SENTENCE_TRANSFORMERS_AVAILABLE and SentenceTransformer is not None:
             try:
                 # Use a lightweight model
                 _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+                _embedding_model.max_seq_length = 256
+                _is_st = True
                 logger.info("Loaded sentence-transformers model: all-MiniLM-L6-v2")
             except Exception as e:
                 logger.warning(f"Failed to load sentence-transformers model: {e}")
@@ -107,10 +274,64 @@ def get_embedding_model():
     return _embedding_model
 
 
+def _doc_key(text: str) -> bytes:
+    """Cache key for a document's embedding."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> Optional[np.ndarray]:
+    """Look up a cached document embedding, marking it recently used."""
+    with _doc_cache_lock:
+        embedding = _DOC_CACHE.get(key)
+        if embedding is not None:
+            _DOC_CACHE.move_to_end(key)
+        return embedding
+
+
+def _cache_put(key: bytes, embedding: np.ndarray) -> None:
+    """Cache a document embedding, evicting the least recently used beyond DOC_CACHE_SIZE."""
+    with _doc_cache_lock:
+        _DOC_CACHE[key] = embedding
+        _DOC_CACHE.move_to_end(key)
+        while len(_DOC_CACHE) > DOC_CACHE_SIZE:
+            _DOC_CACHE.popitem(last=False)
+
+
+def _model_encode(texts: List[str]) -> np.ndarray:
+    """Encode texts with the embedding model, returning a 2-D float32 array."""
+    model = get_embedding_model()
+    
+    # Use the model's encode method
+    if _is_st:
+        # Unit-length outputs, so cosine similarity is a plain dot product
+        embeddings = model.encode(
+            texts,
+            batch_size=ST_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    else:
+        embeddings = model.encode(texts)
+    return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+
+
+def _fallback_encode(texts: List[str]) -> np.ndarray:
+    """Encode texts with the deterministic embedder when the model fails."""
+    global _fallback_embedder
+    if _fallback_embedder is None:
+        _fallback_embedder = ImprovedDeterministicEmbedder()
+    return _fallback_embedder.encode(texts)
+
+
 def embed_texts(texts: Union[str, List[str]]) -> np.ndarray:
     """
     Generate embeddings for text(s).
     
+    Embeddings are cached by content hash, so only texts not seen recently
+    reach the model. A single text may get the cached array itself, which
+    is read-only.
+    
     Args:
         texts: Single text string or list of text strings
         
@@ -118,59 +339,144 @@ def embed_texts(texts: Union[str, List[str]]) -> np.ndarray:
         Numpy array of embeddings. Shape (embedding_dim,) for single text,
         or (num_texts, embedding_dim) for multiple texts.
     """
-    model = get_embedding_model()
+    if isinstance(texts, str):
+        texts = [texts]
+        single_text = True
+    else:
+        single_text = False
     
-    try:
-        # Use the model's encode method
-        embeddings = model.encode(texts)
-        return embeddings
-    except Exception as e:
-        logger.error(f"Error generating embeddings: {e}")
-        # Fallback to simple deterministic method
-        if isinstance(texts, str):
-            texts = [texts]
-            single_text = True
-        else:
-            single_text = False
+    if not texts:
+        return np.zeros((0, 384), dtype=np.float32)
+    
+    keys = [_doc_key(text) for text in texts]
+    embeddings = [_cache_get(key) for key in keys]
+    misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    
+    if misses:
+        miss_texts = [texts[i] for i in misses]
+        try:
+            fresh = _model_encode(miss_texts)
+            cacheable = True
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            # Fallback to the deterministic embedder; never cached, so the
+            # model gets another try next time
+            fresh = _fallback_encode(miss_texts)
+            cacheable = False
         
-        embeddings = np.zeros((len(texts), 384), dtype=np.float32)
+        for i, embedding in zip(misses, fresh):
+            if cacheable:
+                embedding = embedding.copy()
+                embedding.setflags(write=False)
+                _cache_put(keys[i], embedding)
+            embeddings[i] = embedding
+    
+    if single_text:
+        return embeddings[0]
+    return np.stack(embeddings)
+
+
+def quantize_embeddings(
+    embeddings: np.ndarray,
+    ranges: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Scalar-quantize float embeddings to int8.
+    
+    Each dimension is mapped linearly from its [min, max] range onto
+    [-128, 127]. Queries must be quantized with the ranges of the corpus
+    they are compared against, so pass the corpus ranges back in for them.
+    This is the sentence-transformers int8 scheme, except that values
+    outside the ranges are clipped instead of wrapping around.
+    
+    Args:
+        embeddings: Array of shape (num_texts, embedding_dim)
+        ranges: Optional (2, embedding_dim) array of per-dimension min and
+            max values; computed from embeddings when omitted
         
-        for i, text in enumerate(texts):
-            text_hash = hashlib.md5(text.encode()).digest()
-            for j in range(384):
-                byte_idx = j % len(text_hash)
-                embeddings[i, j] = (text_hash[byte_idx] / 255.0) * 2 - 1
-            
-            norm = np.linalg.norm(embeddings[i])
-            if norm > 0:
-                embeddings[i] = embeddings[i] / norm
-        
-        if single_text:
-            return embeddings[0]
-        return embeddings
+    Returns:
+        int8 array with the same shape as embeddings
+    """
+    if ranges is None:
+        ranges = np.vstack((np.min(embeddings, axis=0), np.max(embeddings, axis=0)))
+    starts = ranges[0, :]
+    steps = (ranges[1, :] - starts) / 255
+    # Constant dimensions carry no information; map them to the same code
+    steps[steps == 0] = 1.0
+    return np.clip((embeddings - starts) / steps - 128, -128, 127).astype(np.int8)
 
 
-def compute_similarity(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
-    """Compute cosine similarity between two embeddings."""
-    # Ensure embeddings are normalized
-    norm1 = np.linalg.norm(embedding1)
-    norm2 = np.linalg.norm(embedding2)
+def compute_similarity(
+    embedding1: np.ndarray,
+    embedding2: np.ndarray,
+    assume_normalized: bool = False
+) -> float:
+    """
+    Compute cosine similarity between two embeddings.
+    
+    Args:
+        embedding1: First embedding
+        embedding2: Second embedding
+        assume_normalized: Both embeddings are already unit length (as
+            embed_texts returns them), so the dot product is the similarity
+        
+    Returns:
+        Cosine similarity, or 0.0 if either embedding is all zeros
+    """
+    if assume_normalized:
+        return float(np.vdot(embedding1, embedding2))
     
-    if norm1 == 0 or norm2 == 0:
+    # One square root of the product of squared norms instead of two norms
+    denom_sq = np.vdot(embedding1, embedding1) * np.vdot(embedding2, embedding2)
+    if denom_sq == 0:
         return 0.0
     
     # Cosine similarity
-    similarity = np.dot(embedding1, embedding2) / (norm1 * norm2)
+    similarity = np.vdot(embedding1, embedding2) / np.sqrt(denom_sq)
     return float(similarity)
 
 
-def batch_embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
+def compute_similarity_batch(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    assume_normalized: bool = True
+) -> np.ndarray:
+    """
+    Compute cosine similarity between a query and every row of a matrix.
+    
+    Scoring is one matrix-vector product, so keep stored embeddings stacked
+    in a single (num_vectors, embedding_dim) float32 array, already
+    normalized, rather than calling compute_similarity in a loop.
+    
+    Args:
+        query: Query embedding of shape (embedding_dim,)
+        matrix: Embeddings of shape (num_vectors, embedding_dim)
+        assume_normalized: Query and rows are already unit length
+        
+    Returns:
+        float32 array of num_vectors similarities; all-zero rows score 0.0
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32)
+    scores = matrix @ query
+    if assume_normalized:
+        return scores
+    
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    np.divide(scores, norms, out=scores, where=norms > 0)
+    scores[norms == 0] = 0.0
+    return scores
+
+
+def batch_embed_texts(texts: List[str], batch_size: int = 128) -> np.ndarray:
     """
     Generate embeddings for texts in batches for memory efficiency.
     
     Args:
         texts: List of text strings
-        batch_size: Size of each batch
+        batch_size: Size of each batch; sentence-transformers batches
+            internally (ST_BATCH_SIZE), so this only applies to the
+            deterministic embedder
         
     Returns:
         Numpy array of embeddings
@@ -178,16 +484,19 @@ def batch_embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
     if not texts:
         return np.array([], dtype=np.float32).reshape(0, 384)
     
-    all_embeddings = []
+    get_embedding_model()
+    if _is_st:
+        return embed_texts(list(texts)).reshape(len(texts), -1)
+    
+    # Sized from the first batch, then filled in place
+    embeddings = None
     
     for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
+        batch = list(texts[i:i + batch_size])
         batch_embeddings = embed_texts(batch)
         
-        # Ensure 2D array
-        if len(batch_embeddings.shape) == 1:
-            batch_embeddings = batch_embeddings.reshape(1, -1)
-        
-        all_embeddings.append(batch_embeddings)
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch_embeddings.shape[-1]), dtype=np.float32)
+        embeddings[i:i + len(batch)] = batch_embeddings
     
-    return np.vstack(all_embeddings)
\ No newline at end of file
+    return embeddings
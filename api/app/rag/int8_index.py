@@ -0,0 +1,118 @@
+"""In-process int8 vector index over the codex markdown files."""
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import logging
+
+from .chunker import chunk_markdown
+from .embeddings import batch_embed_texts, embed_texts, quantize_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class Int8Index:
+    """
+    Brute-force vector index that keeps its embeddings as int8.
+    
+    Vectors take a quarter of the memory of float32, and scoring is an
+    integer dot product between the quantized query and every chunk.
+    """
+    
+    def __init__(self, chunks: List[Dict[str, Any]]):
+        """
+        Embed and quantize chunks.
+        
+        Args:
+            chunks: Chunk dicts with at least a "text" key; any other keys
+                are returned with search results and used for filtering
+        """
+        self.chunks = chunks
+        if chunks:
+            embeddings = batch_embed_texts([chunk["text"] for chunk in chunks])
+            self.ranges = np.vstack((np.min(embeddings, axis=0), np.max(embeddings, axis=0)))
+            self.vectors = quantize_embeddings(embeddings, self.ranges)
+        else:
+            self.ranges = None
+            self.vectors = np.zeros((0, 384), dtype=np.int8)
+    
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the k chunks scoring highest against the query.
+        
+        Args:
+            query: Query text
+            k: Number of results to return
+            filters: Optional metadata filters (exact match on chunk keys)
+        
+        Returns:
+            Matching chunk dicts, best first, each with a "score"
+        """
+        if not self.chunks or k <= 0:
+            return []
+        
+        query_vector = quantize_embeddings(embed_texts(query).reshape(1, -1), self.ranges)[0]
+        # Widen before multiplying; int8 products overflow
+        scores = self.vectors.astype(np.int32) @ query_vector.astype(np.int32)
+        
+        if filters:
+            allowed = np.fromiter(
+                (all(chunk.get(key) == value for key, value in filters.items()) for chunk in self.chunks),
+                dtype=bool,
+                count=len(self.chunks)
+            )
+            candidates = np.flatnonzero(allowed)
+        else:
+            candidates = np.arange(len(self.chunks))
+        
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        
+        return [dict(self.chunks[i], score=int(scores[i])) for i in ordered]
+
+
+# Indexes are rebuilt only when the codex files change
+_codex_index: Optional[Int8Index] = None
+_codex_signature: Optional[Tuple] = None
+
+
+def get_codex_index(codex_dir: str = "data/codex") -> Int8Index:
+    """
+    Get the int8 index over the codex markdown files, rebuilding it if any changed.
+    
+    Args:
+        codex_dir: Directory holding the codex .md files
+    
+    Returns:
+        Int8Index whose chunks carry source_path, start_line, end_line,
+        text and type="codex"
+    """
+    global _codex_index, _codex_signature
+    
+    paths = sorted(Path(codex_dir).glob("*.md"))
+    signature = tuple((str(path), path.stat().st_mtime_ns) for path in paths)
+    if _codex_index is not None and signature == _codex_signature:
+        return _codex_index
+    
+    chunks = []
+    for path in paths:
+        source_path = f"codex/{path.name}"
+        for chunk in chunk_markdown(path.read_text(encoding="utf-8")):
+            chunks.append({
+                "source_path": source_path,
+                "start_line": chunk["start_line"],
+                "end_line": chunk["end_line"],
+                "text": chunk["text"],
+                "type": "codex"
+            })
+    
+    _codex_index = Int8Index(chunks)
+    _codex_signature = signature
+    logger.info(f"Built int8 codex index with {len(chunks)} chunks from {len(paths)} files")
+    return _codex_index
@@ -0,0 +1,153 @@
+"""Semantic cache for retrieval queries using random-projection LSH."""
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import threading
+import time
+import logging
+
+import numpy as np
+
+from .embeddings import embed_texts
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """
+    LRU + TTL cache that also serves near-duplicate queries.
+    
+    Exact repeats are answered from a dict lookup. Other queries are embedded
+    and hashed into several random-projection LSH tables; any cached entry
+    sharing a bucket with the same k/filters and cosine similarity above the
+    threshold is returned instead of running a new vector search.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 300.0,
+        threshold: float = 0.95,
+        num_bits: int = 16,
+        num_tables: int = 8,
+        dim: int = 384,
+        seed: int = 0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.dim = dim
+        
+        rng = np.random.default_rng(seed)
+        # One (num_bits, dim) hyperplane set per table
+        self._planes = rng.standard_normal((num_tables, num_bits, dim)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(num_bits)).astype(np.int64)
+        
+        # entry key -> (unit embedding or None, signatures, results, stored_at)
+        self._entries: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self._buckets: List[Dict[int, set]] = [{} for _ in range(num_tables)]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _scope(k: int, filters: Optional[Dict[str, Any]]) -> Tuple[int, str]:
+        """Results are only interchangeable for the same k and filters."""
+        return k, json.dumps(filters or {}, sort_keys=True, default=str)
+    
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        """Embed a query as a unit vector, or None if it cannot be hashed."""
+        vec = np.asarray(embed_texts(query), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if vec.shape != (self.dim,) or norm == 0:
+            return None
+        return vec / norm
+    
+    def _signatures(self, vec: np.ndarray) -> np.ndarray:
+        """Compute one LSH bucket signature per table."""
+        bits = (self._planes @ vec) > 0
+        return bits.astype(np.int64) @ self._bit_weights
+    
+    def get(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict]]:
+        """Return cached results for this query or a near-duplicate of it."""
+        scope = self._scope(k, filters)
+        key = (query,) + scope
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[3] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._evict(key)
+        
+        vec = self._embed(query)
+        if vec is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        signatures = self._signatures(vec)
+        
+        with self._lock:
+            candidates = set()
+            for table, signature in zip(self._buckets, signatures.tolist()):
+                candidates.update(table.get(signature, ()))
+            
+            best_key, best_sim = None, self.threshold
+            for candidate in candidates:
+                if candidate[1:] != scope:
+                    continue
+                cached_vec, _, _, stored_at = self._entries[candidate]
+                if now - stored_at > self.ttl_seconds:
+                    continue
+                sim = float(cached_vec @ vec)
+                if sim >= best_sim:
+                    best_key, best_sim = candidate, sim
+            
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key][2]
+    
+    def put(self, query: str, k: int, filters: Optional[Dict[str, Any]], results: List[Dict]) -> None:
+        """Cache results for a query."""
+        key = (query,) + self._scope(k, filters)
+        vec = self._embed(query)
+        signatures = self._signatures(vec) if vec is not None else None
+        
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (vec, signatures, results, time.monotonic())
+            if signatures is not None:
+                for table, signature in zip(self._buckets, signatures.tolist()):
+                    table.setdefault(signature, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+    
+    def _evict(self, key: Tuple) -> None:
+        """Remove an entry and its bucket memberships (lock must be held)."""
+        _, signatures, _, _ = self._entries.pop(key)
+        if signatures is None:
+            return
+        for table, signature in zip(self._buckets, signatures.tolist()):
+            bucket = table.get(signature)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[signature]
+    
+    def clear(self) -> None:
+        """Drop all cached results, e.g. after the index changes."""
+        with self._lock:
+            self._entries.clear()
+            for table in self._buckets:
+                table.clear()
+
+
+# Shared cache for canon retrieval; cleared whenever Chroma collections change
+canon_query_cache = SemanticQueryCache()
@@ -2,10 +2,14 @@
 from typing import List, Dict, Any, Optional
 from .chroma_client import get_chroma_client
 from .embeddings import embed_texts
+from .query_cache import canon_query_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Collections searched for canon, with k split between them
+_CANON_COLLECTIONS = ("codex_docs", "manuscript_scenes")
+
 
 def retrieve_canon(
     query: str,
@@ -27,36 +31,100 @@ def retrieve_canon(
         - start_line: Starting line number
         - end_line: Ending line number
     """
+    # Repeated and near-duplicate queries (e.g. the generic world-rules query
+    # issued for every scene) are served without a vector search
+    cached = canon_query_cache.get(query, k, filters)
+    if cached is not None:
+        return list(cached)
+    
     client = get_chroma_client()
     
     # Search in both codex and manuscript collections
     all_results = []
     
-    for collection in ["codex_docs", "manuscript_scenes"]:
+    for collection in _CANON_COLLECTIONS:
         results = client.query(
             collection=collection,
             query_text=query,
             top_k=k // 2,  # Split k between collections
             filters=filters
         )
-        
-        # Format results with receipts
-        for i, doc_id in enumerate(results.get("ids", [])):
-            metadata = results["metadatas"][i] if i < len(results["metadatas"]) else {}
-            document = results["documents"][i] if i < len(results.get("documents", [])) else ""
-            
-            all_results.append({
-                "text": document or metadata.get("text", ""),
-                "source_path": metadata.get("source_path", "unknown"),
-                "start_line": metadata.get("start_line", 0),
-                "end_line": metadata.get("end_line", 0),
-                "distance": results["distances"][i] if i < len(results["distances"]) else 1.0,
-                "collection": collection
-            })
+        all_results.extend(_format_canon_results(results, collection))
     
     # Sort by distance and return top k
     all_results.sort(key=lambda x: x.get("distance", 1.0))
-    return all_results[:k]
+    top_results = all_results[:k]
+    canon_query_cache.put(query, k, filters, top_results)
+    return list(top_results)
+
+
+def retrieve_canon_batch(
+    queries: List[str],
+    k: int = 12,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Retrieve canon information for several queries at once.
+    
+    Cache misses are sent to each collection as a single batched query
+    instead of one round-trip per query.
+    
+    Args:
+        queries: Query texts
+        k: Number of results to retrieve per query
+        filters: Optional metadata filters
+        
+    Returns:
+        One list of passages per query, as returned by retrieve_canon
+    """
+    batched: List[Optional[List[Dict[str, Any]]]] = []
+    pending = []
+    for i, query in enumerate(queries):
+        cached = canon_query_cache.get(query, k, filters)
+        batched.append(list(cached) if cached is not None else None)
+        if cached is None:
+            pending.append(i)
+    
+    if pending:
+        client = get_chroma_client()
+        pending_queries = [queries[i] for i in pending]
+        all_results = [[] for _ in pending]
+        
+        for collection in _CANON_COLLECTIONS:
+            results = client.query_batch(
+                collection=collection,
+                query_texts=pending_queries,
+                top_k=k // 2,  # Split k between collections
+                filters=filters
+            )
+            for query_results, collection_results in zip(all_results, results):
+                query_results.extend(_format_canon_results(collection_results, collection))
+        
+        for i, query_results in zip(pending, all_results):
+            query_results.sort(key=lambda x: x.get("distance", 1.0))
+            top_results = query_results[:k]
+            canon_query_cache.put(queries[i], k, filters, top_results)
+            batched[i] = list(top_results)
+    
+    return batched
+
+
+def _format_canon_results(results: Dict[str, Any], collection: str) -> List[Dict[str, Any]]:
+    """Format raw collection query results as canon passages with receipts."""
+    formatted = []
+    for i, doc_id in enumerate(results.get("ids", [])):
+        metadata = results["metadatas"][i] if i < len(results["metadatas"]) else {}
+        document = results["documents"][i] if i < len(results.get("documents", [])) else ""
+        
+        formatted.append({
+            "text": document or metadata.get("text", ""),
+            "source_path": metadata.get("source_path", "unknown"),
+            "start_line": metadata.get("start_line", 0),
+            "end_line": metadata.get("end_line", 0),
+            "distance": results["distances"][i] if i < len(results["distances"]) else 1.0,
+            "collection": collection
+        })
+    return formatted
 
 
 def retrieve_similar(
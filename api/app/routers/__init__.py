@@ -1,3 +1,15 @@
 """API routers package."""
-from .ingest import router as ingest_router
-from .scenes import router as scenes_router
\ No newline at end of file
+import importlib
+
+# Router re-exports are resolved on first access so that importing one router
+# module does not load the others
+_LAZY_ROUTERS = {
+    "ingest_router": ".ingest",
+    "scenes_router": ".scenes",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ROUTERS:
+        return importlib.import_module(_LAZY_ROUTERS[name], __name__).router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
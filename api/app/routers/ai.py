@@ -173,20 +173,25 @@ async def get_text_recommendations(
         )
 
 
+_MOCK_TYPES = ("style", "clarity", "tone")
+
+
 def generate_mock_recommendations(text: str) -> List[AIRecommendation]:
     """Generate mock recommendations for demo purposes."""
     recommendations = []
-    sentences = text.split('.')[:3]  # Analyze first 3 sentences
+    # Analyze first 3 sentences; stop splitting after the third delimiter
+    sentences = text.split('.', 3)[:3]
     
     for i, sentence in enumerate(sentences):
-        if sentence.strip():
+        sentence = sentence.strip()
+        if sentence:
             recommendations.append(AIRecommendation(
                 id=f"mock_{i}",
-                original_text=sentence.strip() + '.',
-                suggested_text=sentence.strip() + ', enhancing the narrative flow.',
+                original_text=f"{sentence}.",
+                suggested_text=f"{sentence}, enhancing the narrative flow.",
                 reason="Adding descriptive elements improves reader engagement",
                 confidence=0.75 + (i * 0.05),
-                type=["style", "clarity", "tone"][i % 3]
+                type=_MOCK_TYPES[i % 3]
             ))
     
     return recommendations
@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 import logging
 
-from ..auth import AuthManager, get_current_user
+from ..auth import AuthManager, get_current_user, publish_session, publish_llm_key
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 logger = logging.getLogger(__name__)
@@ -52,6 +52,7 @@ async def create_session(request: CreateSessionRequest):
     """
     try:
         api_key = AuthManager.create_user_session(request.name or "default")
+        await publish_session(AuthManager.hash_key(api_key))
         
         return SessionResponse(
             api_key=api_key,
@@ -86,6 +87,7 @@ async def store_llm_key(
             )
         
         AuthManager.store_user_llm_key(user["key_hash"], request.openrouter_api_key)
+        await publish_llm_key(user["key_hash"], stored=True)
         
         return LLMKeyResponse(
             message="OpenRouter API key stored successfully",
@@ -125,6 +127,8 @@ async def remove_llm_key(user: dict = Depends(get_current_user)):
     """
     try:
         removed = AuthManager.remove_user_llm_key(user["key_hash"])
+        if removed:
+            await publish_llm_key(user["key_hash"], stored=False)
         
         return LLMKeyResponse(
             message="LLM key removed successfully" if removed else "No LLM key to remove",
@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from ..db import get_read_session
-from ..models import Scene, Artifact, Job
+from ..models import Artifact, Job
+from ..statements import get_scene
 from ..services.diff_service import diff_service
 
 
@@ -97,7 +98,7 @@ async def get_scene_variants(
     """Get all variants for a scene with diffs."""
     
     # Get scene
-    scene = db.query(Scene).filter(Scene.id == scene_id).first()
+    scene = get_scene(db, scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail="Scene not found")
     
@@ -185,7 +186,7 @@ async def apply_patch(
 ):
     """Apply a patch to a scene (preview only - doesn't modify files)."""
     
-    scene = db.query(Scene).filter(Scene.id == scene_id).first()
+    scene = get_scene(db, scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail="Scene not found")
     
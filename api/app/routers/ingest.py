@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from ..db import get_write_session
 from ..models import Scene
+from ..statements import get_scene
 from ..rag.chroma_client import get_chroma_client
 from ..rag.embeddings import embed_texts
 from ..rag.chunker import chunk_markdown
@@ -121,7 +122,7 @@ async def index_files(
                 # Only create database records for manuscript scenes
                 if "manuscript" in path_str:
                     # Check if scene already exists
-                    existing = db.query(Scene).filter(Scene.id == scene_id).first()
+                    existing = get_scene(db, scene_id)
 
                     if not existing or request.reindex:
                         # Create or update scene
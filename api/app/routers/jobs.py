@@ -1,15 +1,20 @@
 """Background job management endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import logging
 
-from ..auth import get_current_user, require_rate_limit, get_user_llm_client
+from ..auth import enforce_rate_limit, get_current_user, require_rate_limit, get_user_llm_client
 from ..background import job_queue
 
 router = APIRouter(prefix="/jobs", tags=["background-jobs"])
 logger = logging.getLogger(__name__)
 
+# Agent pass jobs per user per minute; a batch counts once per scene
+AGENT_PASS_RATE_LIMIT = 10
+# Scenes per batch; larger batches could never fit in the rate limit
+MAX_BATCH_SCENES = AGENT_PASS_RATE_LIMIT
+
 
 class JobRequest(BaseModel):
     """Request to create a background job."""
@@ -123,7 +128,7 @@ async def get_job_status(
 async def create_agent_pass_job(
     scene_id: str,
     agents: List[str] = ["grim_editor", "tone_metrics"],
-    user: dict = Depends(require_rate_limit(limit=10, window=60)),
+    user: dict = Depends(require_rate_limit(limit=AGENT_PASS_RATE_LIMIT, window=60)),
     llm_client = Depends(get_user_llm_client)
 ):
     """
@@ -164,4 +169,52 @@ async def create_agent_pass_job(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create agent pass job"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/agent-pass/batch", response_model=List[JobResponse])
+async def create_agent_pass_jobs(
+    scene_ids: List[str] = Body(..., min_length=1, max_length=MAX_BATCH_SCENES),
+    agents: List[str] = ["grim_editor", "tone_metrics"],
+    user: dict = Depends(get_current_user),
+    llm_client = Depends(get_user_llm_client)
+):
+    """
+    Create agent pass jobs for several scenes at once.
+    
+    All jobs are queued in a single Redis round trip. Each scene counts
+    against the agent pass rate limit, as if submitted on its own.
+    """
+    await enforce_rate_limit(user, limit=AGENT_PASS_RATE_LIMIT, window=60, cost=len(scene_ids))
+    
+    try:
+        payloads = [{"scene_id": scene_id, "agents": agents} for scene_id in scene_ids]
+        
+        # Add user's LLM key if available
+        if hasattr(llm_client, 'api_key') and llm_client.api_key:
+            for payload in payloads:
+                payload["user_llm_key"] = llm_client.api_key
+        
+        job_ids = await job_queue.enqueue_many(
+            [("agent_pass", payload) for payload in payloads],
+            priority=1  # Higher priority for agent passes
+        )
+        
+        logger.info(f"Created {len(job_ids)} agent pass jobs for user {user['name']}")
+        
+        return [
+            JobResponse(
+                job_id=job_id,
+                type="agent_pass",
+                status="queued",
+                message=f"Agent pass job created for scene {scene_id}"
+            )
+            for job_id, scene_id in zip(job_ids, scene_ids)
+        ]
+        
+    except Exception as e:
+        logger.error(f"Failed to create agent pass jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create agent pass jobs"
+        )
@@ -1,8 +1,9 @@
 """Pass orchestrator router for running agent passes."""
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Awaitable
 from datetime import datetime
+import asyncio
 import uuid
 import json
 import os
@@ -18,12 +19,17 @@ from ..agents.plot_twister import run_plot_twister
 from ..agents.red_team import run_red_team
 from ..agents.reviewer_pack import run_reviewer_pack
 from ..agents.voice_simulator import run_voice_simulator
-from ..rag.retrieve import retrieve_canon
+from ..rag.retrieve import retrieve_canon, retrieve_canon_batch
 from ..db import get_read_session, get_write_session
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/passes", tags=["passes"])
 
+# Caps concurrent agent calls across all passes so fan-out stays below
+# upstream LLM rate limits
+MAX_CONCURRENT_AGENTS = 8
+_agent_semaphore = asyncio.Semaphore(MAX_CONCURRENT_AGENTS)
+
 
 class PassRequest(BaseModel):
     """Request model for running a pass."""
@@ -99,58 +105,45 @@ async def run_pass(
             requested_agents=request.agents
         )
         
-        # Run individual agents if supervisor didn't fully orchestrate
-        agent_results = {}
+        # Run individual agents concurrently; they only share the scene input
+        agent_calls = {}
         
         if "lore_archivist" in request.agents:
-            try:
-                lore_result = await run_lore_archivist(
-                    scene_text=scene_text,
-                    scene_meta=scene_meta,
-                    retrieve_fn=lambda q, k, f: retrieve_canon(q, k, f) if 'retrieve_canon' in globals() else [],
-                    model="anthropic/claude-3-opus"
-                )
-                agent_results["lore_archivist"] = lore_result
-            except Exception as e:
-                agent_results["lore_archivist"] = {
-                    "error": f"Lore Archivist failed: {str(e)}",
-                    "status": "failed",
-                    "findings": [],
-                    "receipts": []
-                }
+            agent_calls["lore_archivist"] = run_lore_archivist(
+                scene_text=scene_text,
+                scene_meta=scene_meta,
+                retrieve_fn=lambda q, k, f: retrieve_canon(q, k, f) if 'retrieve_canon' in globals() else [],
+                model="anthropic/claude-3-opus",
+                retrieve_batch_fn=retrieve_canon_batch
+            )
         
         if "grim_editor" in request.agents:
-            try:
-                grim_result = await run_grim_editor(
-                    scene_text=scene_text,
-                    style_targets=metrics_config,
-                    model="anthropic/claude-3-haiku"
-                )
-                agent_results["grim_editor"] = grim_result
-            except Exception as e:
-                agent_results["grim_editor"] = {
-                    "error": f"Grim Editor failed: {str(e)}",
-                    "status": "failed",
-                    "diff": "",
-                    "rationale": [f"Editor execution failed: {str(e)}"]
-                }
+            agent_calls["grim_editor"] = run_grim_editor(
+                scene_text=scene_text,
+                style_targets=metrics_config,
+                model="anthropic/claude-3-haiku"
+            )
         
         if "tone_metrics" in request.agents:
-            try:
-                tone_result = run_tone_metrics(
-                    scene_text=scene_text,
-                    targets=metrics_config,
-                    model="anthropic/claude-3-haiku"
-                )
-                agent_results["tone_metrics"] = tone_result
-            except Exception as e:
-                agent_results["tone_metrics"] = {
-                    "error": f"Tone Metrics failed: {str(e)}",
-                    "status": "failed",
-                    "metrics_before": {},
-                    "overall_assessment": f"Analysis failed: {str(e)}",
-                    "recommendations": ["Please review the scene text and try again"]
-                }
+            # Tone metrics is synchronous, keep it off the event loop
+            agent_calls["tone_metrics"] = asyncio.to_thread(
+                run_tone_metrics,
+                scene_text=scene_text,
+                targets=metrics_config,
+                model="anthropic/claude-3-haiku"
+            )
+        
+        results = await asyncio.gather(
+            *(_run_bounded(call) for call in agent_calls.values()),
+            return_exceptions=True
+        )
+        
+        agent_results = {}
+        for agent_name, result in zip(agent_calls, results):
+            if isinstance(result, Exception):
+                agent_results[agent_name] = _agent_failure(agent_name, result)
+            else:
+                agent_results[agent_name] = result
         
         # Combine results into variants
         variants = supervisor_result.get("variants", {})
@@ -209,6 +202,37 @@ async def run_pass(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _run_bounded(call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Await an agent call while holding a slot in the shared agent semaphore."""
+    async with _agent_semaphore:
+        return await call
+
+
+def _agent_failure(agent_name: str, error: Exception) -> Dict[str, Any]:
+    """Build the fallback result for an agent that raised."""
+    if agent_name == "lore_archivist":
+        return {
+            "error": f"Lore Archivist failed: {str(error)}",
+            "status": "failed",
+            "findings": [],
+            "receipts": []
+        }
+    if agent_name == "grim_editor":
+        return {
+            "error": f"Grim Editor failed: {str(error)}",
+            "status": "failed",
+            "diff": "",
+            "rationale": [f"Editor execution failed: {str(error)}"]
+        }
+    return {
+        "error": f"Tone Metrics failed: {str(error)}",
+        "status": "failed",
+        "metrics_before": {},
+        "overall_assessment": f"Analysis failed: {str(error)}",
+        "recommendations": ["Please review the scene text and try again"]
+    }
+
+
 @router.get("/status")
 async def passes_status():
     """Get passes service status."""
@@ -41,8 +41,8 @@ async def generate_patches(
     start_time = time.time()
 
     # Validate scene exists
-    from ..models import Scene
-    scene = db.query(Scene).filter(Scene.id == request.scene_id).first()
+    from ..statements import get_scene
+    scene = get_scene(db, request.scene_id)
     if not scene:
         raise HTTPException(status_code=404, detail=f"Scene {request.scene_id} not found")
 
@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 import logging
 
-from ..auth import get_current_user, require_rate_limit, get_user_llm_client
+from ..auth import RateLimiter, get_current_user, require_rate_limit, get_user_llm_client
 from ..services.llm_client import LLMClient
 
 router = APIRouter(prefix="/protected", tags=["protected"])
@@ -44,8 +44,7 @@ async def get_user_info(user: dict = Depends(get_current_user)):
     Shows session details and usage statistics.
     """
     # Calculate remaining rate limit
-    rate_info = user["rate_limit"]
-    remaining = max(0, 60 - rate_info["requests"])
+    remaining = await RateLimiter.remaining_requests(user, limit=60, window=60)
     
     return UserInfoResponse(
         name=user["name"],
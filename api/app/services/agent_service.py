@@ -10,6 +10,7 @@ from .ai_service import ai_service
 from .metrics_service import metrics_service, TextMetrics
 from .diff_service import diff_service, DiffResult
 from ..models import Scene, Job, Artifact
+from ..statements import get_scene
 from ..db import get_write_session
 
 
@@ -84,7 +85,7 @@ class AgentService:
         
         with get_write_session() as db:
             # Get scene
-            scene = db.query(Scene).filter(Scene.id == scene_id).first()
+            scene = get_scene(db, scene_id)
             if not scene:
                 raise ValueError(f"Scene {scene_id} not found")
             
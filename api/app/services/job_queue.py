@@ -10,6 +10,7 @@ from queue import Queue, PriorityQueue
 import time
 
 from ..models import Job
+from ..statements import get_job
 from ..db import get_write_session
 from .agent_service import agent_service
 
@@ -139,7 +140,7 @@ class JobQueue:
         """Get status of a specific job."""
         
         with get_write_session() as db:
-            job = db.query(Job).filter(Job.id == job_id).first()
+            job = get_job(db, job_id)
             if not job:
                 return None
             
@@ -184,7 +185,7 @@ class JobQueue:
             
             # Update database status
             with get_write_session() as db:
-                db_job = db.query(Job).filter(Job.id == job_id).first()
+                db_job = get_job(db, job_id)
                 if db_job:
                     db_job.status = "running"
                     db.commit()
@@ -203,7 +204,7 @@ class JobQueue:
             
             # Update database with success
             with get_write_session() as db:
-                db_job = db.query(Job).filter(Job.id == job_id).first()
+                db_job = get_job(db, job_id)
                 if db_job:
                     db_job.status = "completed"
                     db_job.processing_time = processing_time
@@ -227,7 +228,7 @@ class JobQueue:
             else:
                 # Mark as failed
                 with get_write_session() as db:
-                    db_job = db.query(Job).filter(Job.id == job_id).first()
+                    db_job = get_job(db, job_id)
                     if db_job:
                         db_job.status = "failed"
                         db_job.error_message = str(e)
@@ -259,12 +260,12 @@ class JobQueue:
         """Handle metrics calculation job."""
         
         from .metrics_service import metrics_service
-        from ..models import Scene
+        from ..statements import get_scene
         
         scene_id = job.scene_id
         
         with get_write_session() as db:
-            scene = db.query(Scene).filter(Scene.id == scene_id).first()
+            scene = get_scene(db, scene_id)
             if not scene:
                 raise ValueError(f"Scene {scene_id} not found")
             
@@ -1,7 +1,9 @@
 """LLM client service for OpenRouter API calls as specified in Prompt 11."""
 import httpx
+import hashlib
 import json
 import os
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 import logging
 import asyncio
@@ -10,6 +12,40 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Process-wide pooled HTTP client shared by every LLMClient
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared pooled HTTP client for OpenRouter calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            http2=HTTP2_AVAILABLE
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, releasing pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 @dataclass
 class LLMResponse:
@@ -23,9 +59,10 @@ class LLMResponse:
 class LLMClient:
     """Client for OpenRouter API calls."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize LLM client with API key."""
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize LLM client with API key and an optional HTTP client to reuse."""
         self.api_key = api_key or os.environ.get("OPENROUTER_API_KEY", "")
+        self._http_client = http_client
         self.base_url = "https://openrouter.ai/api/v1"
         self.default_timeout = 60
         
@@ -89,58 +126,60 @@ class LLMClient:
             "X-Title": "Writers Room X"
         }
         
+        # Reuse pooled connections instead of a fresh TCP/TLS handshake per call
+        client = self._http_client or get_http_client()
+        
         # Retry logic with exponential backoff
         max_retries = 3
         backoff_factor = 2
         
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"{self.base_url}/chat/completions",
-                        json=payload,
-                        headers=headers,
-                        timeout=timeout
-                    )
+                response = await client.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    headers=headers,
+                    timeout=timeout
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    
+                    # Extract response content
+                    content = data["choices"][0]["message"]["content"]
+                    usage = data.get("usage", {})
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Extract response content
-                        content = data["choices"][0]["message"]["content"]
-                        usage = data.get("usage", {})
-                        
-                        # Calculate cost (rough estimates per model)
-                        cost_per_1k_tokens = {
-                            "anthropic/claude-3-opus": 0.015,
-                            "anthropic/claude-3-sonnet": 0.003,
-                            "anthropic/claude-3-haiku": 0.00025,
-                            "openai/gpt-4-turbo-preview": 0.01,
-                            "openai/gpt-4": 0.03,
-                            "openai/gpt-3.5-turbo": 0.001
-                        }
-                        
-                        rate = cost_per_1k_tokens.get(actual_model, 0.001)
-                        total_tokens = usage.get("total_tokens", 0)
-                        cost_usd = (total_tokens / 1000) * rate
-                        
-                        return LLMResponse(
-                            content=content,
-                            model=actual_model,
-                            usage=usage,
-                            cost_usd=cost_usd
-                        )
+                    # Calculate cost (rough estimates per model)
+                    cost_per_1k_tokens = {
+                        "anthropic/claude-3-opus": 0.015,
+                        "anthropic/claude-3-sonnet": 0.003,
+                        "anthropic/claude-3-haiku": 0.00025,
+                        "openai/gpt-4-turbo-preview": 0.01,
+                        "openai/gpt-4": 0.03,
+                        "openai/gpt-3.5-turbo": 0.001
+                    }
                     
-                    elif response.status_code == 429:  # Rate limit
-                        wait_time = backoff_factor ** attempt
-                        logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                        await asyncio.sleep(wait_time)
-                        continue
+                    rate = cost_per_1k_tokens.get(actual_model, 0.001)
+                    total_tokens = usage.get("total_tokens", 0)
+                    cost_usd = (total_tokens / 1000) * rate
+                    
+                    return LLMResponse(
+                        content=content,
+                        model=actual_model,
+                        usage=usage,
+                        cost_usd=cost_usd
+                    )
+                
+                elif response.status_code == 429:  # Rate limit
+                    wait_time = backoff_factor ** attempt
+                    logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                else:
+                    error_data = response.json()
+                    raise Exception(f"API error {response.status_code}: {error_data}")
                     
-                    else:
-                        error_data = response.json()
-                        raise Exception(f"API error {response.status_code}: {error_data}")
-                        
             except httpx.TimeoutException:
                 if attempt < max_retries - 1:
                     wait_time = backoff_factor ** attempt
@@ -175,6 +214,37 @@ def get_llm_client() -> LLMClient:
     return _llm_client
 
 
+# Per-key clients, keyed by the SHA-256 digest of the API key so raw keys
+# are not used as dict keys
+_key_clients: "OrderedDict[bytes, LLMClient]" = OrderedDict()
+_KEY_CLIENTS_MAX = 256
+
+
+def get_llm_client_for_key(api_key: Optional[str]) -> LLMClient:
+    """
+    Get a cached LLM client for a user-supplied API key.
+    
+    Args:
+        api_key: OpenRouter API key, or None for the default (environment) client
+        
+    Returns:
+        LLMClient reused across agents, passes and requests for this key
+    """
+    if not api_key:
+        return get_llm_client()
+    
+    digest = hashlib.sha256(api_key.encode()).digest()
+    client = _key_clients.get(digest)
+    if client is None:
+        client = LLMClient(api_key=api_key)
+        _key_clients[digest] = client
+        if len(_key_clients) > _KEY_CLIENTS_MAX:
+            _key_clients.popitem(last=False)
+    else:
+        _key_clients.move_to_end(digest)
+    return client
+
+
 async def complete(
     messages: List[Dict[str, str]],
     model: str = "anthropic/claude-3-haiku",
@@ -1,19 +1,90 @@
 """Semantic search service for manuscript and codex content."""
 import numpy as np
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-import json
+from sqlalchemy import func, text
 
-from ..models import SceneEmbedding, Scene
+from ..models import SceneEmbedding, Scene, _use_pgvector
 from ..db import get_read_session
 
+# Upper bound on the age of the cached embedding matrix. Ingestion may run in
+# another process, and replacing a scene's chunks can leave the row count and
+# max id unchanged, so the cheap probe alone cannot catch every change.
+EMBEDDING_CACHE_TTL = 60.0
+
 
 class SearchService:
     """Service for semantic and keyword search across content."""
     
     def __init__(self):
         self.embedding_dim = 384
+        # Row-normalized float32 (N, D) matrix of chunk embeddings plus the
+        # (scene_id, chunk_no, content) of each row, loaded on first search
+        self._embedding_matrix: Optional[np.ndarray] = None
+        self._embedding_rows: List[tuple] = []
+        # (row count, max id) of scene_embeddings when the matrix was loaded
+        self._embedding_signature: Optional[Tuple] = None
+        self._embedding_loaded_at = 0.0
+    
+    def invalidate_embeddings(self) -> None:
+        """Drop the cached embedding matrix after chunks are re-indexed."""
+        self._embedding_matrix = None
+        self._embedding_rows = []
+        self._embedding_signature = None
+    
+    def _probe_embeddings(self, db: Session) -> Tuple:
+        """Cheap fingerprint of the scene_embeddings table."""
+        return tuple(db.query(func.count(SceneEmbedding.id), func.max(SceneEmbedding.id)).one())
+    
+    def _load_embedding_matrix(self, db: Session) -> np.ndarray:
+        """
+        Stack all chunk embeddings into one normalized matrix.
+        
+        The cached matrix is reused while the table fingerprint is unchanged
+        and it is younger than EMBEDDING_CACHE_TTL seconds.
+        """
+        # Probed before loading: a commit in between only triggers a reload
+        signature = self._probe_embeddings(db)
+        if (
+            self._embedding_matrix is not None
+            and signature == self._embedding_signature
+            and time.monotonic() - self._embedding_loaded_at < EMBEDDING_CACHE_TTL
+        ):
+            return self._embedding_matrix
+        
+        rows = db.query(
+            SceneEmbedding.scene_id,
+            SceneEmbedding.chunk_no,
+            SceneEmbedding.content,
+            SceneEmbedding.embedding
+        ).all()
+        
+        vectors = []
+        meta = []
+        for scene_id, chunk_no, content, embedding in rows:
+            if embedding is None:
+                continue
+            vec = np.asarray(embedding, dtype=np.float32)
+            if vec.shape != (self.embedding_dim,):
+                continue
+            vectors.append(vec)
+            meta.append((scene_id, chunk_no, content))
+        
+        if vectors:
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            # Zero vectors stay zero and score 0.0, as in cosine_similarity
+            norms[norms == 0] = 1.0
+            matrix /= norms
+        else:
+            matrix = np.empty((0, self.embedding_dim), dtype=np.float32)
+        
+        self._embedding_matrix = matrix
+        self._embedding_rows = meta
+        self._embedding_signature = signature
+        self._embedding_loaded_at = time.monotonic()
+        return matrix
     
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
@@ -62,31 +133,70 @@ class SearchService:
         # Generate query embedding
         query_embedding = self.generate_query_embedding(query)
         
-        # Get all embeddings from database
-        embeddings = db.query(SceneEmbedding).all()
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query_vec)
+        if query_norm > 0:
+            query_vec /= query_norm
+        
+        if _use_pgvector(db.get_bind().dialect):
+            return self._semantic_search_pgvector(query_vec, db, limit, threshold)
+        
+        # Score every chunk in one matrix-vector product
+        matrix = self._load_embedding_matrix(db)
+        similarities = matrix @ query_vec
+        
+        candidates = np.flatnonzero(similarities >= threshold)
+        if 0 < limit < candidates.size:
+            top = np.argpartition(-similarities[candidates], limit - 1)[:limit]
+            candidates = np.sort(candidates[top])
+        candidates = candidates[np.argsort(-similarities[candidates], kind='stable')][:max(limit, 0)]
         
-        # Calculate similarities
         results = []
-        for embedding in embeddings:
-            # Parse embedding (stored as JSON in SQLite)
-            if isinstance(embedding.embedding, str):
-                vec = json.loads(embedding.embedding)
-            else:
-                vec = embedding.embedding
-            
-            similarity = self.cosine_similarity(query_embedding, vec)
-            
-            if similarity >= threshold:
-                results.append({
-                    'scene_id': embedding.scene_id,
-                    'chunk_no': embedding.chunk_no,
-                    'content': embedding.content[:200] + '...' if len(embedding.content) > 200 else embedding.content,
-                    'similarity': similarity
-                })
-        
-        # Sort by similarity and limit
-        results.sort(key=lambda x: x['similarity'], reverse=True)
-        return results[:limit]
+        for idx in candidates:
+            scene_id, chunk_no, content = self._embedding_rows[idx]
+            results.append({
+                'scene_id': scene_id,
+                'chunk_no': chunk_no,
+                'content': content[:200] + '...' if len(content) > 200 else content,
+                'similarity': float(similarities[idx])
+            })
+        
+        return results
+    
+    def _semantic_search_pgvector(
+        self,
+        query_vec: np.ndarray,
+        db: Session,
+        limit: int,
+        threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Rank chunks inside PostgreSQL, walking the HNSW cosine index."""
+        if limit <= 0:
+            return []
+        
+        distance = SceneEmbedding.embedding.cosine_distance(query_vec)
+        # Plain ORDER BY distance LIMIT k so the planner can use the index;
+        # the threshold is applied to the k rows that come back
+        rows = db.query(
+            SceneEmbedding.scene_id,
+            SceneEmbedding.chunk_no,
+            SceneEmbedding.content,
+            distance.label('distance')
+        ).order_by(distance).limit(limit).all()
+        
+        results = []
+        for scene_id, chunk_no, content, dist in rows:
+            similarity = 1.0 - float(dist)
+            if similarity < threshold:
+                break
+            results.append({
+                'scene_id': scene_id,
+                'chunk_no': chunk_no,
+                'content': content[:200] + '...' if len(content) > 200 else content,
+                'similarity': similarity
+            })
+        
+        return results
     
     def keyword_search(
         self,
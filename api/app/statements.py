@@ -0,0 +1,21 @@
+"""Cached statements for the hot ORM point lookups."""
+from typing import Optional
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from .models import Scene, Job
+
+# Lambda statements are built and compiled once, then reused with new
+# parameters on every call instead of rebuilding the query each time
+GET_SCENE_BY_ID = lambda_stmt(lambda: select(Scene).where(Scene.id == bindparam("id")))
+GET_JOB_BY_ID = lambda_stmt(lambda: select(Job).where(Job.id == bindparam("id")))
+
+
+def get_scene(db: Session, scene_id: str) -> Optional[Scene]:
+    """Look up a scene by id."""
+    return db.execute(GET_SCENE_BY_ID, {"id": scene_id}).scalars().first()
+
+
+def get_job(db: Session, job_id: str) -> Optional[Job]:
+    """Look up a job by id."""
+    return db.execute(GET_JOB_BY_ID, {"id": job_id}).scalars().first()
@@ -1,7 +1,9 @@
 """Diff utilities for patch creation and application."""
 import difflib
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 import re
 import logging
 
@@ -47,6 +49,94 @@ def make_unified_diff(original: str, revised: str, filename: str) -> str:
     return "\n".join(diff_lines) + ("\n" if diff_lines else "")
 
 
+def make_span_diff(
+    original: str,
+    revised: str,
+    spans: List[Tuple[int, int, str, str]],
+    filename: str,
+    context: int = 3
+) -> str:
+    """
+    Build a unified diff directly from known in-line substitutions.
+    
+    Avoids re-diffing the whole text when the edits are already known. Spans
+    must not add or remove line breaks; otherwise this falls back to
+    make_unified_diff.
+    
+    Args:
+        original: Original text
+        revised: Text after applying the substitutions
+        spans: (start, end, old, new) substitutions in original coordinates
+        filename: Filename for diff header
+        context: Number of unchanged context lines around each hunk
+        
+    Returns:
+        Unified diff string in the same format as make_unified_diff
+    """
+    if not spans:
+        return make_unified_diff(original, revised, filename)
+    
+    original_lines = original.splitlines(keepends=True)
+    revised_lines = revised.splitlines(keepends=True)
+    if len(original_lines) != len(revised_lines):
+        return make_unified_diff(original, revised, filename)
+    
+    if not original_lines[-1].endswith('\n'):
+        original_lines[-1] += '\n'
+    if not revised_lines[-1].endswith('\n'):
+        revised_lines[-1] += '\n'
+    
+    # Map span offsets to line indices via cumulative line end offsets
+    line_ends = list(accumulate(map(len, original_lines)))
+    changed = sorted({bisect_right(line_ends, start) for start, _, _, _ in spans})
+    changed = [i for i in changed if original_lines[i] != revised_lines[i]]
+    if not changed:
+        return ""
+    
+    # Group changed lines into hunks the way difflib does
+    hunks = []
+    group = [changed[0]]
+    for i in changed[1:]:
+        if i - group[-1] - 1 > 2 * context:
+            hunks.append(group)
+            group = []
+        group.append(i)
+    hunks.append(group)
+    
+    diff_lines = [f"--- a/{filename}", f"+++ b/{filename}"]
+    total = len(original_lines)
+    for group in hunks:
+        first = max(0, group[0] - context)
+        last = min(total, group[-1] + 1 + context)
+        hunk_range = _format_range(first, last)
+        diff_lines.append(f"@@ -{hunk_range} +{hunk_range} @@")
+        
+        i = first
+        while i < last:
+            if original_lines[i] == revised_lines[i]:
+                diff_lines.append(' ' + original_lines[i])
+                i += 1
+                continue
+            block_end = i
+            while block_end < last and original_lines[block_end] != revised_lines[block_end]:
+                block_end += 1
+            diff_lines.extend('-' + line for line in original_lines[i:block_end])
+            diff_lines.extend('+' + line for line in revised_lines[i:block_end])
+            i = block_end
+    
+    return "\n".join(diff_lines) + "\n"
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range like difflib's unified diff headers."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
 def apply_patch_to_file(file_path: str, unified_diff: str) -> bool:
     """
     Apply a unified diff patch to a file.
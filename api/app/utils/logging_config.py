@@ -4,6 +4,8 @@ import logging.config
 from pathlib import Path
 from typing import Dict, Any
 
+from ..middleware import CorrelationIdFilter
+
 def setup_logging(log_level: str = "INFO", log_file: str = "logs/writers_room.log") -> None:
     """
     Configure application logging.
@@ -22,14 +24,20 @@ def setup_logging(log_level: str = "INFO", log_file: str = "logs/writers_room.lo
         "disable_existing_loggers": False,
         "formatters": {
             "detailed": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
+                "format": "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(filename)s:%(lineno)d - %(message)s",
                 "datefmt": "%Y-%m-%d %H:%M:%S"
             },
             "simple": {
                 "format": "%(levelname)s - %(name)s - %(message)s"
             },
             "json": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+                "format": "%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s"
+            }
+        },
+        "filters": {
+            # Supplies %(correlation_id)s from the request context
+            "correlation_id": {
+                "()": CorrelationIdFilter
             }
         },
         "handlers": {
@@ -37,12 +45,14 @@ def setup_logging(log_level: str = "INFO", log_file: str = "logs/writers_room.lo
                 "class": "logging.StreamHandler",
                 "level": log_level,
                 "formatter": "simple",
+                "filters": ["correlation_id"],
                 "stream": "ext://sys.stdout"
             },
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": log_level,
                 "formatter": "detailed",
+                "filters": ["correlation_id"],
                 "filename": log_file,
                 "maxBytes": 10485760,  # 10MB
                 "backupCount": 5,
@@ -52,6 +62,7 @@ def setup_logging(log_level: str = "INFO", log_file: str = "logs/writers_room.lo
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": "ERROR",
                 "formatter": "detailed",
+                "filters": ["correlation_id"],
                 "filename": "logs/errors.log",
                 "maxBytes": 10485760,  # 10MB
                 "backupCount": 3,
@@ -0,0 +1,19 @@
+"""Shared test fixtures."""
+import pytest
+
+from app.background import job_queue
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    """Run without a shared Redis connection."""
+    monkeypatch.setattr(job_queue, "redis_client", None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Run against an in-memory Redis."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(job_queue, "redis_client", redis_client)
+    return redis_client
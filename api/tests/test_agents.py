@@ -130,8 +130,8 @@ class TestBaseAgent:
         messages = [{"role": "user", "content": "test"}]
         result = await agent.call_llm(messages)
         
-        assert "error" in result
-        assert "No LLM client configured" in result["error"]
+        assert result.content is None
+        assert "No LLM client configured" in result.error
         
     @pytest.mark.asyncio
     async def test_call_llm_with_mock_client(self):
@@ -152,10 +152,11 @@ class TestBaseAgent:
         messages = [{"role": "user", "content": "test"}]
         result = await agent.call_llm(messages)
         
-        assert result["content"] == "Test response"
-        assert result["model"] == "test_model"
-        assert result["usage"]["tokens"] == 100
-        assert result["cost_usd"] == 0.01
+        assert result.error is None
+        assert result.content == "Test response"
+        assert result.model == "test_model"
+        assert result.usage["tokens"] == 100
+        assert result.cost_usd == 0.01
         
         # Verify client was called correctly
         mock_client.complete.assert_called_once()
@@ -0,0 +1,92 @@
+"""Tests for authentication helpers and rate limiting."""
+import pytest
+
+from app import auth
+from app.auth import AuthManager, RateLimiter
+
+
+class _Clock:
+    """Settable stand-in for time.time and time.monotonic."""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the clocks the rate limiter reads."""
+    clock = _Clock()
+    monkeypatch.setattr(auth.time, "time", clock)
+    monkeypatch.setattr(auth.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def user_info():
+    """A fresh session's user info, as get_current_user returns it."""
+    key_hash = AuthManager.hash_key(AuthManager.create_user_session("rate-limit-test"))
+    info = AuthManager.validate_api_key_hash(key_hash)
+    info["key_hash"] = key_hash
+    return info
+
+
+async def _allowed(user_info, count, limit=3, window=60):
+    """Run count checks and return which were allowed."""
+    return [await RateLimiter.check_sliding_window(user_info, limit, window) for _ in range(count)]
+
+
+class TestLocalWindow:
+    """Without Redis the limiter falls back to the in-process fixed window."""
+    
+    @pytest.mark.asyncio
+    async def test_allows_up_to_limit(self, clock, user_info, no_redis):
+        """The request after the limit is denied until the window restarts."""
+        assert await _allowed(user_info, 4) == [True, True, True, False]
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 0
+        
+        clock.now += 60
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 3
+        assert await _allowed(user_info, 1) == [True]
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 2
+
+
+class TestSlidingWindow:
+    """With Redis, requests age out individually as the window slides."""
+    
+    @pytest.mark.asyncio
+    async def test_allow_then_deny(self, clock, user_info, fake_redis):
+        """The limit holds within any rolling window, not per fixed window."""
+        assert await _allowed(user_info, 1) == [True]
+        clock.now += 30
+        assert await _allowed(user_info, 3) == [True, True, False]
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 0
+        
+        # Only the first request has left the window
+        clock.now += 31
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 1
+        assert await _allowed(user_info, 2) == [True, False]
+        
+        # The two requests from t=30 age out together
+        clock.now += 30
+        assert await RateLimiter.remaining_requests(user_info, 3, 60) == 2
+    
+    @pytest.mark.asyncio
+    async def test_denied_requests_are_not_counted(self, clock, user_info, fake_redis):
+        """Rejected requests do not extend the block."""
+        assert await _allowed(user_info, 10) == [True] * 3 + [False] * 7
+        
+        clock.now += 61
+        assert await _allowed(user_info, 3) == [True, True, True]
+    
+    @pytest.mark.asyncio
+    async def test_windows_are_per_user(self, clock, user_info, fake_redis):
+        """One user's requests do not count against another's."""
+        other_hash = AuthManager.hash_key(AuthManager.create_user_session("other"))
+        other = dict(AuthManager.validate_api_key_hash(other_hash), key_hash=other_hash)
+        
+        assert await _allowed(user_info, 4) == [True, True, True, False]
+        assert await _allowed(other, 1) == [True]
+        assert await RateLimiter.remaining_requests(other, 3, 60) == 2
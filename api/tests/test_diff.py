@@ -0,0 +1,126 @@
+"""Tests for diff utilities."""
+import difflib
+import random
+
+from app.utils.diff import make_span_diff, make_unified_diff
+
+
+def _apply_spans(text, spans):
+    """Apply (start, end, old, new) substitutions given in original coordinates."""
+    pieces = []
+    last_end = 0
+    for start, end, _, new in spans:
+        pieces.append(text[last_end:start])
+        pieces.append(new)
+        last_end = end
+    pieces.append(text[last_end:])
+    return ''.join(pieces)
+
+
+def _difflib_diff(original, revised, context):
+    """Reference diff: difflib with make_unified_diff's newline handling."""
+    original_lines = [line if line.endswith('\n') else line + '\n' for line in original.splitlines(keepends=True)]
+    revised_lines = [line if line.endswith('\n') else line + '\n' for line in revised.splitlines(keepends=True)]
+    diff_lines = list(difflib.unified_diff(
+        original_lines, revised_lines, fromfile="a/scene.md", tofile="b/scene.md", n=context, lineterm=""
+    ))
+    return "\n".join(diff_lines) + ("\n" if diff_lines else "")
+
+
+def _span(text, old, new, occurrence=0):
+    """Build a span replacing the given occurrence of old."""
+    start = -1
+    for _ in range(occurrence + 1):
+        start = text.index(old, start + 1)
+    return (start, start + len(old), old, new)
+
+
+class TestMakeSpanDiff:
+    """make_span_diff must produce exactly what difflib produces."""
+    
+    def _assert_matches_difflib(self, original, spans, context=3):
+        revised = _apply_spans(original, spans)
+        
+        assert make_span_diff(original, revised, spans, "scene.md", context) == _difflib_diff(original, revised, context)
+    
+    def test_single_line(self):
+        """One substitution in a single-line text."""
+        text = "He walked quickly to the door."
+        
+        self._assert_matches_difflib(text, [_span(text, "walked quickly", "hurried")])
+    
+    def test_trailing_newline(self):
+        """Texts ending with a newline diff the same as those without."""
+        text = "line one\nline two\nline three\n"
+        
+        self._assert_matches_difflib(text, [_span(text, "two", "2")])
+    
+    def test_separate_hunks(self):
+        """Changes more than 2 * context lines apart split into hunks."""
+        lines = [f"line {i} is plain" for i in range(30)]
+        text = "\n".join(lines)
+        spans = [_span(text, "line 2 ", "LINE 2 "), _span(text, "line 25 ", "LINE 25 ")]
+        
+        self._assert_matches_difflib(text, spans)
+        assert make_span_diff(text, _apply_spans(text, spans), spans, "scene.md").count("@@ -") == 2
+    
+    def test_merged_hunks(self):
+        """Changes exactly 2 * context lines apart share a hunk."""
+        lines = [f"line {i} is plain" for i in range(20)]
+        text = "\n".join(lines)
+        spans = [_span(text, "line 3 ", "LINE 3 "), _span(text, "line 10 ", "LINE 10 ")]
+        
+        self._assert_matches_difflib(text, spans)
+    
+    def test_adjacent_lines_and_custom_context(self):
+        """Consecutive changed lines form one -/+ block."""
+        lines = [f"row {i} is plain" for i in range(12)]
+        text = "\n".join(lines)
+        spans = [_span(text, "row 5 ", "ROW 5 "), _span(text, "row 6 ", "ROW 6 ")]
+        
+        for context in (0, 1, 3, 5):
+            self._assert_matches_difflib(text, spans, context)
+    
+    def test_several_spans_on_one_line(self):
+        """Spans on the same line produce a single changed line."""
+        text = "first\nvery big and very small\nlast"
+        spans = [_span(text, "very big", "enormous"), _span(text, "very small", "tiny")]
+        
+        self._assert_matches_difflib(text, spans)
+    
+    def test_noop_span(self):
+        """A span that leaves its line unchanged yields no diff."""
+        text = "same\ntext\n"
+        spans = [_span(text, "text", "text")]
+        
+        assert make_span_diff(text, text, spans, "scene.md") == make_unified_diff(text, text, "scene.md") == ""
+    
+    def test_line_count_change_falls_back(self):
+        """Spans that add line breaks fall back to make_unified_diff."""
+        text = "one, two\nthree"
+        spans = [_span(text, ", ", ".\n")]
+        revised = _apply_spans(text, spans)
+        
+        assert make_span_diff(text, revised, spans, "scene.md") == make_unified_diff(text, revised, "scene.md")
+    
+    def test_random_texts(self):
+        """Random span sets over multi-line texts match difflib."""
+        rng = random.Random(1234)
+        words = ["alpha", "beta", "gamma", "delta", "very", "big", "went", "quickly"]
+        
+        for _ in range(200):
+            lines = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 25))]
+            text = "\n".join(lines) + ("\n" if rng.random() < 0.5 else "")
+            
+            spans = []
+            position = 0
+            for _ in range(rng.randint(1, 6)):
+                start = text.find(rng.choice(words), position)
+                if start < 0:
+                    break
+                old = text[start:text.find(" ", start) if " " in text[start:] else len(text)].split("\n")[0]
+                spans.append((start, start + len(old), old, old.upper()))
+                position = start + len(old)
+            
+            if spans:
+                self._assert_matches_difflib(text, spans, rng.randint(0, 4))
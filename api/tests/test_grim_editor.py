@@ -0,0 +1,92 @@
+"""Tests for the grim editor's editing passes."""
+import random
+
+import pytest
+
+from app.agents.grim_editor import (
+    _LITERAL_PASS,
+    _LITERAL_SUBS,
+    _apply_grim_edits,
+    _apply_literal_subs,
+    _find_literal_matches,
+    run_grim_editor,
+)
+
+# Same table matched by the regex alone
+_REGEX_PASS = _LITERAL_PASS._replace(automaton=None)
+
+needs_automaton = pytest.mark.skipif(_LITERAL_PASS.automaton is None, reason="pyahocorasick not installed")
+
+
+class TestPassOrder:
+    """The passes run in the original order: strengthen, rhythm, redundancies, word choice, dialogue."""
+    
+    def test_word_choice_runs_after_rhythm(self):
+        """Word choice replaces the clause the rhythm pass capitalized."""
+        text = "The man saw that he left, got the keys and ran."
+        
+        assert _apply_grim_edits(text, {}) == "The man saw that he left. obtained the keys and ran."
+    
+    def test_rhythm_sees_strengthened_verbs(self):
+        """Strengthening shifts the words the rhythm pass inspects."""
+        text = "He walked quickly but the door held, then very big stuff fell."
+        
+        assert _apply_grim_edits(text, {}) == "He hurried but the door held, then enormous items fell."
+    
+    @pytest.mark.asyncio
+    async def test_run_matches_pipeline(self):
+        """run_grim_editor diffs the same text the pipeline produces."""
+        for text in (
+            "The man saw that he left, got the keys and ran.",
+            "He walked quickly to the very big door.",
+            '"I got the stuff," she said quietly.',
+        ):
+            result = await run_grim_editor(text, {})
+            edited = _apply_grim_edits(text, {})
+            
+            assert "+" + edited in result["diff"]
+            assert len(result["rationale"]) == 3
+
+
+class TestLiteralMatching:
+    """The Aho-Corasick automaton finds the same matches as the regex alternation."""
+    
+    def test_regex_prefers_longest_phrase(self):
+        """At one position the longer phrase wins: "went quickly" over "went"."""
+        text = "She went quickly home, then went back."
+        
+        assert _find_literal_matches(text, _REGEX_PASS) == [(4, 16), (28, 32)]
+    
+    @needs_automaton
+    @pytest.mark.parametrize("text", [
+        "She went quickly home, then went back.",
+        "He WENT QUICKLY and Very Big things fell.",
+        "wentquickly avery big very bigger _very big very big_",
+        "a lot of very big, very small, very big end result",
+        "It was very very big and he went went quickly.",
+        '"I said quietly," he said quietly.',
+        "",
+    ])
+    def test_automaton_matches_regex(self, text):
+        """Leftmost-longest whole-word matches agree on edge cases."""
+        assert _find_literal_matches(text, _LITERAL_PASS) == _find_literal_matches(text, _REGEX_PASS)
+    
+    @needs_automaton
+    def test_automaton_matches_regex_random(self):
+        """Random phrase soups produce the same matches and edits."""
+        rng = random.Random(42)
+        tokens = [word for phrase in _LITERAL_SUBS for word in phrase.split()]
+        tokens += ["the", "door", "_", "x", ",", ".", '"', "\n", "VERY", "Went"]
+        
+        for _ in range(500):
+            text = "".join(rng.choice(tokens) + rng.choice(["", " ", " ", "-"]) for _ in range(rng.randint(0, 40)))
+            
+            assert _find_literal_matches(text, _LITERAL_PASS) == _find_literal_matches(text, _REGEX_PASS)
+            assert _apply_literal_subs(text, _LITERAL_PASS) == _apply_literal_subs(text, _REGEX_PASS)
+    
+    @needs_automaton
+    def test_length_changing_lowercase_uses_regex(self):
+        """Text whose lowercase form changes length still gets correct offsets."""
+        text = "\u0130 went quickly and it was very big."
+        
+        assert _find_literal_matches(text, _LITERAL_PASS) == [m.span() for m in _LITERAL_PASS.regex.finditer(text)]
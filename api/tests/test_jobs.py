@@ -0,0 +1,131 @@
+"""Tests for bulk job submission."""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.auth import AuthManager
+from app.background import _job_dict_decoder, job_queue
+from app.routers import jobs
+from app.routers.jobs import AGENT_PASS_RATE_LIMIT, MAX_BATCH_SCENES
+
+
+@pytest.fixture
+def app():
+    """An app serving only the job endpoints."""
+    app = FastAPI()
+    app.include_router(jobs.router, prefix="/api")
+    return app
+
+
+@pytest.fixture
+def api_key():
+    """A fresh session's API key."""
+    return AuthManager.create_user_session("jobs-test")
+
+
+@pytest.fixture
+def handled(monkeypatch):
+    """Record agent_pass payloads instead of running the agents."""
+    payloads = []
+    
+    async def handler(payload):
+        payloads.append(payload)
+        return {"ok": True}
+    
+    monkeypatch.setitem(job_queue.job_handlers, "agent_pass", handler)
+    return payloads
+
+
+async def _post_batch(app, api_key, scene_ids):
+    """POST /jobs/agent-pass/batch for the given scenes."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(
+            "/api/jobs/agent-pass/batch",
+            json={"scene_ids": scene_ids, "agents": ["grim_editor"]},
+            headers={"X-API-Key": api_key}
+        )
+
+
+class TestEnqueueMany:
+    """enqueue_many stores and queues every job in one transaction."""
+    
+    @pytest.mark.asyncio
+    async def test_jobs_are_stored_and_queued(self, fake_redis):
+        """Each job is stored with its payload and queued at the shared priority."""
+        jobs_to_add = [("agent_pass", {"scene_id": f"ch01_s0{i}"}) for i in range(3)]
+        
+        job_ids = await job_queue.enqueue_many(jobs_to_add, priority=2)
+        
+        assert len(set(job_ids)) == 3
+        for job_id, (job_type, payload) in zip(job_ids, jobs_to_add):
+            stored = _job_dict_decoder.decode(await fake_redis.hget(f"job:{job_id}", "data"))
+            assert stored["type"] == job_type
+            assert stored["payload"] == payload
+            assert stored["status"] == "queued"
+        assert dict(await fake_redis.zrange("job_queue", 0, -1, withscores=True)) == {
+            job_id.encode(): 2.0 for job_id in job_ids
+        }
+    
+    @pytest.mark.asyncio
+    async def test_no_jobs(self, fake_redis):
+        """An empty batch queues nothing."""
+        assert await job_queue.enqueue_many([]) == []
+        assert await fake_redis.zcard("job_queue") == 0
+    
+    @pytest.mark.asyncio
+    async def test_runs_immediately_without_redis(self, no_redis, handled):
+        """Without Redis every job runs in order before returning."""
+        job_ids = await job_queue.enqueue_many([("agent_pass", {"scene_id": "a"}), ("agent_pass", {"scene_id": "b"})])
+        
+        assert len(job_ids) == 2
+        assert handled == [{"scene_id": "a"}, {"scene_id": "b"}]
+
+
+class TestAgentPassBatch:
+    """Batches are capped and each scene counts against the rate limit."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_is_queued(self, app, api_key, fake_redis):
+        """One job is queued per scene, in request order."""
+        response = await _post_batch(app, api_key, ["ch01_s01", "ch01_s02"])
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert [job["message"] for job in body] == [
+            "Agent pass job created for scene ch01_s01",
+            "Agent pass job created for scene ch01_s02",
+        ]
+        assert await fake_redis.zcard("job_queue") == 2
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [0, MAX_BATCH_SCENES + 1])
+    async def test_batch_size_is_bounded(self, app, api_key, fake_redis, count):
+        """Empty and oversized batches are rejected before anything is queued."""
+        response = await _post_batch(app, api_key, [f"scene_{i}" for i in range(count)])
+        
+        assert response.status_code == 422
+        assert await fake_redis.zcard("job_queue") == 0
+    
+    @pytest.mark.asyncio
+    async def test_each_scene_counts_against_limit(self, app, api_key, fake_redis):
+        """A batch that would exceed the remaining allowance gets 429 and queues nothing."""
+        first = await _post_batch(app, api_key, [f"scene_{i}" for i in range(AGENT_PASS_RATE_LIMIT - 2)])
+        rejected = await _post_batch(app, api_key, ["scene_a", "scene_b", "scene_c"])
+        last = await _post_batch(app, api_key, ["scene_a", "scene_b"])
+        
+        assert first.status_code == 200
+        assert rejected.status_code == 429
+        assert rejected.headers["retry-after"] == "60"
+        assert last.status_code == 200
+        assert await fake_redis.zcard("job_queue") == AGENT_PASS_RATE_LIMIT
+    
+    @pytest.mark.asyncio
+    async def test_each_scene_counts_without_redis(self, app, api_key, no_redis, handled):
+        """The in-process fallback charges per scene too, before running any job."""
+        first = await _post_batch(app, api_key, [f"scene_{i}" for i in range(AGENT_PASS_RATE_LIMIT)])
+        rejected = await _post_batch(app, api_key, ["scene_a"])
+        
+        assert first.status_code == 200
+        assert rejected.status_code == 429
+        assert len(handled) == AGENT_PASS_RATE_LIMIT
@@ -0,0 +1,60 @@
+"""Tests for the security middleware."""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.middleware import setup_middleware
+
+
+@pytest.fixture
+def app():
+    """A minimal app behind the project's middleware stack."""
+    app = FastAPI()
+    setup_middleware(app)
+    
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+    
+    return app
+
+
+async def _get_with_origin(app, origin):
+    """GET /ping as a cross-origin request from origin."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        return await client.get("/ping", headers={"Origin": origin})
+
+
+class TestCorsOrigins:
+    """Local dev servers and Replit hosts are allowed; lookalikes are not."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("origin", [
+        "http://localhost:3000",
+        "http://localhost:5000",
+        "https://writers-room.replit.app",
+        "https://writers-room.replit.dev",
+        "https://0a1b2c3d-4e5f-00-2x9yz8w7v6u5.picard.replit.dev",
+    ])
+    async def test_allowed(self, app, origin):
+        """Allowed origins are echoed back."""
+        response = await _get_with_origin(app, origin)
+        
+        assert response.headers.get("access-control-allow-origin") == origin
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("origin", [
+        "http://localhost:8080",
+        "http://writers-room.replit.app",
+        "https://replit.dev",
+        "https://writers-room.replit.dev.evil.com",
+        "https://evilreplit.dev",
+        "https://writers-room.replit.app:8443",
+        "https://a..replit.dev",
+    ])
+    async def test_rejected(self, app, origin):
+        """Other origins get no CORS grant."""
+        response = await _get_with_origin(app, origin)
+        
+        assert "access-control-allow-origin" not in response.headers
@@ -0,0 +1,99 @@
+"""Tests for the custom column types."""
+import numpy as np
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import EMBEDDING_DIM, VECTOR_AVAILABLE, EmbeddingType, MsgPackType
+
+
+@pytest.fixture
+def engine():
+    """An in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _round_trip(engine, column_type, value):
+    """Insert a value into a throwaway table and read it back."""
+    metadata = MetaData()
+    table = Table("items", metadata, Column("id", Integer, primary_key=True), Column("value", column_type))
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table).values(id=1, value=value))
+        return conn.execute(select(table.c.value)).scalar_one()
+
+
+class TestMsgPackType:
+    """Payload columns come back as the values that were stored."""
+    
+    @pytest.mark.parametrize("value", [
+        {"beats": ["arrival", "conflict"], "weight": 0.5, "nested": {"ok": True, "none": None}},
+        ["a", 1, 2.5, False],
+        {},
+        "plain",
+    ])
+    def test_round_trip(self, engine, value):
+        """JSON-like values survive storage unchanged."""
+        assert _round_trip(engine, MsgPackType(), value) == value
+    
+    def test_null(self, engine):
+        """None is stored as SQL NULL."""
+        assert _round_trip(engine, MsgPackType(), None) is None
+        assert MsgPackType().process_bind_param(None, sqlite.dialect()) is None
+
+
+class TestEmbeddingType:
+    """Embeddings come back as float32 vectors of the stored length."""
+    
+    def test_float32_round_trip(self, engine):
+        """Float32 frames are exact."""
+        vector = np.random.default_rng(0).standard_normal(EMBEDDING_DIM).astype(np.float32)
+        
+        stored = _round_trip(engine, EmbeddingType(), vector)
+        
+        assert stored.dtype == np.float32
+        np.testing.assert_array_equal(stored, vector)
+    
+    def test_list_input(self, engine):
+        """Plain lists of floats are accepted, as the indexer passes them."""
+        stored = _round_trip(engine, EmbeddingType(), [0.5, -1.0, 2.0])
+        
+        np.testing.assert_array_equal(stored, np.array([0.5, -1.0, 2.0], dtype=np.float32))
+    
+    def test_int8_round_trip(self, engine):
+        """Quantized frames are a quarter the size and within one scale step."""
+        vector = np.random.default_rng(1).standard_normal(EMBEDDING_DIM).astype(np.float32)
+        column_type = EmbeddingType(quantize=True)
+        
+        stored = _round_trip(engine, column_type, vector)
+        
+        assert stored.dtype == np.float32
+        assert stored.shape == vector.shape
+        scale = np.abs(vector).max() / 127.0
+        assert np.abs(stored - vector).max() <= scale / 2 + 1e-6
+        float_frame = EmbeddingType().process_bind_param(vector, sqlite.dialect())
+        int8_frame = column_type.process_bind_param(vector, sqlite.dialect())
+        assert len(int8_frame) < len(float_frame) / 3
+    
+    def test_zero_vector(self, engine):
+        """An all-zero vector quantizes without dividing by zero."""
+        stored = _round_trip(engine, EmbeddingType(quantize=True), np.zeros(8, dtype=np.float32))
+        
+        np.testing.assert_array_equal(stored, np.zeros(8, dtype=np.float32))
+    
+    def test_null(self, engine):
+        """None is stored as SQL NULL."""
+        assert _round_trip(engine, EmbeddingType(), None) is None
+    
+    @pytest.mark.skipif(not VECTOR_AVAILABLE, reason="pgvector not installed")
+    def test_postgresql_uses_vector(self):
+        """PostgreSQL binds plain float32 arrays for the native vector column."""
+        dialect = postgresql.dialect()
+        vector = [0.25] * EMBEDDING_DIM
+        
+        bound = EmbeddingType().process_bind_param(vector, dialect)
+        
+        assert bound.dtype == np.float32
+        np.testing.assert_array_equal(bound, np.asarray(vector, dtype=np.float32))
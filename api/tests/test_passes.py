@@ -0,0 +1,145 @@
+"""Tests for the pass status endpoint."""
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.endpoints import passes
+from app.endpoints.passes import PassState
+
+
+@pytest.fixture
+def app():
+    """An app serving only the pass endpoints."""
+    app = FastAPI()
+    app.include_router(passes.router, prefix="/api")
+    return app
+
+
+@pytest.fixture
+def state(monkeypatch):
+    """A running pass with two of four agents done."""
+    state = PassState(pass_id="pass-1", created_at="2024-01-01T00:00:00", completed_count=2, total_expected=4)
+    monkeypatch.setattr(passes, "pass_results", {state.pass_id: state})
+    return state
+
+
+async def _get_status(app, pass_id, etag=None):
+    """GET /passes/{pass_id}/status, optionally conditional on an ETag."""
+    headers = {"If-None-Match": etag} if etag else {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(f"/api/passes/{pass_id}/status", headers=headers)
+
+
+class TestPassStatus:
+    """Status polls are answered with an ETag and 304 while nothing changes."""
+    
+    @pytest.mark.asyncio
+    async def test_status_body_and_etag(self, app, state, no_redis):
+        """The body reports progress and carries a quoted ETag."""
+        response = await _get_status(app, state.pass_id)
+        
+        assert response.status_code == 200
+        assert response.json() == {"pass_id": "pass-1", "status": "running", "progress": "50%"}
+        assert response.headers["etag"].startswith('"')
+    
+    @pytest.mark.asyncio
+    async def test_matching_etag_is_not_modified(self, app, state, no_redis):
+        """A matching If-None-Match gets an empty 304 with the same ETag."""
+        etag = (await _get_status(app, state.pass_id)).headers["etag"]
+        
+        response = await _get_status(app, state.pass_id, etag)
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
+    @pytest.mark.asyncio
+    async def test_progress_changes_etag(self, app, state, no_redis):
+        """A stale ETag gets the new body once progress moves."""
+        etag = (await _get_status(app, state.pass_id)).headers["etag"]
+        
+        state.completed_count = 3
+        response = await _get_status(app, state.pass_id, etag)
+        
+        assert response.status_code == 200
+        assert response.json()["progress"] == "75%"
+        assert response.headers["etag"] != etag
+        
+        state.status = "completed"
+        assert (await _get_status(app, state.pass_id, response.headers["etag"])).json()["progress"] == "100%"
+    
+    @pytest.mark.asyncio
+    async def test_unknown_pass(self, app, state, no_redis):
+        """Unknown pass ids are 404 with or without an ETag."""
+        assert (await _get_status(app, "missing")).status_code == 404
+        assert (await _get_status(app, "missing", '"abc"')).status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_status_from_redis(self, app, state, fake_redis, monkeypatch):
+        """Another instance's published state is served with the same ETag."""
+        await passes._publish_state(state)
+        # This instance has no local copy of the pass
+        monkeypatch.setattr(passes, "pass_results", {})
+        body, etag = state.status_body()
+        
+        response = await _get_status(app, state.pass_id)
+        
+        assert response.status_code == 200
+        assert json.loads(response.content) == json.loads(body)
+        assert response.headers["etag"] == etag
+        assert (await _get_status(app, state.pass_id, etag)).status_code == 304
+
+
+class TestProcessPass:
+    """The supervisor's variants are required; other agents may fail alone."""
+    
+    @staticmethod
+    def _request():
+        """A pass request running only the grim editor."""
+        return passes.PassRequest(
+            scene_text="He walked quickly to the very big door.",
+            scene_meta={"id": "ch01_s01"},
+            agents=["grim_editor"]
+        )
+    
+    @pytest.mark.asyncio
+    async def test_supervisor_failure_fails_pass(self, monkeypatch, no_redis):
+        """A supervisor error marks the pass failed instead of completing without variants."""
+        async def failing_supervisor(**kwargs):
+            raise RuntimeError("planner down")
+        
+        monkeypatch.setattr(passes, "run_supervisor", failing_supervisor)
+        monkeypatch.setattr(passes, "pass_results", {})
+        
+        state = await passes.process_pass("pass-1", self._request())
+        
+        assert state.status == "failed"
+        assert state.error == "planner down"
+        assert state.agent_results["supervisor"] == {"error": "planner down"}
+        # The other agents still ran to completion
+        assert "diff" in state.agent_results["grim_editor"]
+        assert state.completed_count == state.total_expected == 2
+        assert passes.pass_results["pass-1"] is state
+    
+    @pytest.mark.asyncio
+    async def test_agent_failure_keeps_pass(self, monkeypatch, no_redis):
+        """A failing agent is recorded while the pass completes with the supervisor's variants."""
+        async def supervisor(**kwargs):
+            return {"variants": {"safe": {}, "bold": {}}, "cost_usd": 0.5}
+        
+        async def failing_grim_editor(request, llm_client):
+            raise RuntimeError("editor down")
+        
+        monkeypatch.setattr(passes, "run_supervisor", supervisor)
+        monkeypatch.setattr(passes, "_run_grim_editor_task", failing_grim_editor)
+        monkeypatch.setattr(passes, "pass_results", {})
+        
+        state = await passes.process_pass("pass-2", self._request())
+        
+        assert state.status == "completed"
+        assert set(state.variants) == {"safe", "bold"}
+        assert state.agent_results["grim_editor"] == {"error": "editor down"}
+        assert state.cost_usd == 0.5